@@ -0,0 +1,25 @@
+"""
+Cheap ISO 8601 timestamps
+
+Meetings stamp every DB write, transcript line and log line with the
+current local time. datetime.now().isoformat() builds a datetime object
+per call; now_iso() only re-formats the date/time part when the second
+changes and fills in the microseconds with integer math.
+"""
+
+import time
+
+# (second, "YYYY-MM-DDTHH:MM:SS") for the last second formatted. Kept as one
+# tuple so threads never see a second paired with another second's prefix.
+_cache: tuple[int, str] = (-1, "")
+
+
+def now_iso() -> str:
+    """Current local time, formatted like datetime.now().isoformat()."""
+    global _cache
+    second, nanos = divmod(time.time_ns(), 1_000_000_000)
+    cached_second, prefix = _cache
+    if second != cached_second:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(second))
+        _cache = (second, prefix)
+    return f"{prefix}.{nanos // 1000:06d}"
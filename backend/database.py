@@ -8,41 +8,125 @@ Handles:
 - Loading meetings for continuation
 """
 
+import asyncio
 import sqlite3
-import json
-from datetime import datetime
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 from contextlib import contextmanager
-from dataclasses import asdict
+
+import orjson
+
+from clock import now_iso
 
 # Database file location
 DB_PATH = Path(__file__).parent / "meetings.db"
 
+# Stored in PRAGMA user_version once init_db's one-time migrations have run
+# (1: transcripts moved into transcript_entries)
+SCHEMA_VERSION = 1
+
+# journal_mode=WAL is persistent in the database file, so it only needs
+# to be switched on by the first connection; the rest are per-connection
+_wal_initialized = False
+
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",     # WAL is durable enough without FULL fsyncs
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",      # ~16MB page cache
+    "PRAGMA mmap_size=268435456",    # 256MB memory-mapped reads
+    "PRAGMA busy_timeout=5000",      # wait for the writer instead of failing
+)
+
+# Larger pages keep the multi-KB JSON columns (summary, agenda, ...) out of
+# overflow-page chains; only applies to newly created database files
+PAGE_SIZE = 8192
+
+# sqlite3 keeps an LRU of compiled statements per connection; the
+# connections below live for the whole thread, so every helper's SQL is
+# parsed once and then reused
+STATEMENT_CACHE_SIZE = 64
+
+_local = threading.local()
+
+# Async callers hand their queries to these pools so SQLite I/O never runs
+# on the event loop. Each worker thread keeps its own connection via
+# _local. Writes go through a single thread: SQLite only allows one writer
+# at a time anyway, and it keeps saves for a meeting in submission order.
+READER_THREADS = 4
+_reader_pool = ThreadPoolExecutor(max_workers=READER_THREADS, thread_name_prefix="db-reader")
+_writer_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+
 
 def get_connection() -> sqlite3.Connection:
-    """Get a database connection with row factory."""
-    conn = sqlite3.connect(DB_PATH)
+    """Get a database connection with row factory and tuned pragmas."""
+    global _wal_initialized
+
+    conn = sqlite3.connect(
+        DB_PATH,
+        check_same_thread=False,
+        cached_statements=STATEMENT_CACHE_SIZE,
+    )
     conn.row_factory = sqlite3.Row
+
+    if not _wal_initialized:
+        # The pragma reports the mode actually in effect; some filesystems
+        # (e.g. network mounts) can't do WAL and silently stay on DELETE
+        mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+        if mode != "wal":
+            print(f"Warning: SQLite journal_mode is {mode!r}, not 'wal'")
+        _wal_initialized = True
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def _thread_connection() -> sqlite3.Connection:
+    """Get the long-lived connection owned by the current thread."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = _local.conn = get_connection()
     return conn
 
 
 @contextmanager
 def get_db():
-    """Context manager for database connections."""
-    conn = get_connection()
+    """Context manager wrapping one transaction on the thread's connection."""
+    conn = _thread_connection()
     try:
         yield conn
         conn.commit()
     except Exception:
         conn.rollback()
         raise
-    finally:
-        conn.close()
+
+
+def submit_write(func, *args) -> Future:
+    """Queue a write helper on the writer thread without waiting for it."""
+    return _writer_pool.submit(func, *args)
+
+
+async def run_write(func, *args):
+    """Run a write helper on the writer thread from async code."""
+    return await asyncio.wrap_future(submit_write(func, *args))
+
+
+async def run_read(func, *args):
+    """Run a read helper on the reader pool from async code."""
+    return await asyncio.wrap_future(_reader_pool.submit(func, *args))
 
 
 def init_db():
-    """Initialize the database schema."""
+    """Initialize the database schema. Called once at application startup."""
+    if not DB_PATH.exists() or DB_PATH.stat().st_size == 0:
+        # page_size must be set before the first table is written and
+        # cannot change once the file is in WAL mode, so do it up front
+        conn = sqlite3.connect(DB_PATH)
+        conn.execute(f"PRAGMA page_size = {PAGE_SIZE}")
+        conn.execute("VACUUM")
+        conn.close()
+
     with get_db() as conn:
         conn.execute("""
             CREATE TABLE IF NOT EXISTS meetings (
@@ -59,7 +143,8 @@ def init_db():
                 participants TEXT DEFAULT '[]',
                 previous_summary TEXT DEFAULT '',
                 is_active INTEGER DEFAULT 0,
-                agenda TEXT DEFAULT '[]' -- New agenda column
+                agenda TEXT DEFAULT '[]', -- New agenda column
+                transcript_count INTEGER DEFAULT 0
             )
         """)
         
@@ -69,6 +154,13 @@ def init_db():
             ON meetings(updated_at DESC)
         """)
 
+        # Partial index for the "currently active" listing; only ever holds
+        # the handful of meetings being recorded
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_meetings_active_updated
+            ON meetings(is_active, updated_at DESC) WHERE is_active = 1
+        """)
+
         # Add agenda column if it doesn't exist (for existing databases)
         # This is a simple ALTER TABLE, more robust migrations might be needed for complex schemas
         try:
@@ -77,11 +169,53 @@ def init_db():
             if "duplicate column name: agenda" not in str(e):
                 raise
 
+        # Denormalized transcript length so listings don't count entries per row
+        try:
+            conn.execute("ALTER TABLE meetings ADD COLUMN transcript_count INTEGER DEFAULT 0")
+        except sqlite3.OperationalError as e:
+            if "duplicate column name: transcript_count" not in str(e):
+                raise
+
+        # Transcript lines live in an append-only child table so a new
+        # line costs one INSERT instead of rewriting the whole JSON array
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS transcript_entries (
+                meeting_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                speaker TEXT,
+                text TEXT NOT NULL,
+                ts TEXT,
+                PRIMARY KEY (meeting_id, seq)
+            ) WITHOUT ROWID
+        """)
+
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            return
+
+        # One-time: move transcripts stored by older versions into the
+        # child table and fill in transcript_count
+        conn.execute("""
+            INSERT OR IGNORE INTO transcript_entries (meeting_id, seq, speaker, text, ts)
+            SELECT m.id, CAST(j.key AS INTEGER),
+                   json_extract(j.value, '$.speaker'),
+                   json_extract(j.value, '$.text'),
+                   json_extract(j.value, '$.timestamp')
+            FROM meetings m, json_each(m.transcript) j
+            WHERE m.transcript != '[]'
+        """)
+        conn.execute("UPDATE meetings SET transcript = '[]' WHERE transcript != '[]'")
+        conn.execute("""
+            UPDATE meetings SET transcript_count = (
+                SELECT COUNT(*) FROM transcript_entries WHERE meeting_id = meetings.id
+            )
+        """)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
 
 def create_meeting(meeting_id: str, title: str = "Untitled Meeting", agenda: Optional[list[dict]] = None) -> dict:
     """Create a new meeting."""
-    now = datetime.now().isoformat()
-    agenda_json = json.dumps(agenda) if agenda else '[]'
+    now = now_iso()
+    agenda_json = _dumps(agenda) if agenda else '[]'
     
     with get_db() as conn:
         conn.execute("""
@@ -89,7 +223,31 @@ def create_meeting(meeting_id: str, title: str = "Untitled Meeting", agenda: Opt
             VALUES (?, ?, ?, ?, ?)
         """, (meeting_id, title, now, now, agenda_json))
     
-    return get_meeting(meeting_id)
+    # Everything else is a column default, so there's no need to read it back
+    return {
+        "id": meeting_id,
+        "title": title,
+        "created_at": now,
+        "updated_at": now,
+        "transcript": [],
+        "summary": "",
+        "key_points": [],
+        "action_items": [],
+        "decisions": [],
+        "open_questions": [],
+        "participants": [],
+        "_previous_summary": "",
+        "is_active": False,
+        "agenda": agenda or [],
+    }
+
+
+def get_or_create_meeting(meeting_id: str) -> tuple[dict, bool]:
+    """Get a meeting, creating it with defaults if missing. Returns (meeting, created)."""
+    meeting = get_meeting(meeting_id)
+    if meeting:
+        return meeting, False
+    return create_meeting(meeting_id), True
 
 
 def get_meeting(meeting_id: str) -> Optional[dict]:
@@ -99,52 +257,167 @@ def get_meeting(meeting_id: str) -> Optional[dict]:
             "SELECT * FROM meetings WHERE id = ?",
             (meeting_id,)
         ).fetchone()
+        if not row:
+            return None
+        transcript = conn.execute(
+            "SELECT speaker, text, ts FROM transcript_entries WHERE meeting_id = ? ORDER BY seq",
+            (meeting_id,)
+        ).fetchall()
     
-    if not row:
-        return None
+    return _row_to_dict(row, transcript)
+
+
+# Same shape as _row_to_dict, assembled by SQLite so HTTP responses can be
+# returned without a decode/encode round trip through Python
+_MEETING_JSON_SQL = """
+    SELECT json_object(
+        'id', id,
+        'title', title,
+        'created_at', created_at,
+        'updated_at', updated_at,
+        'transcript', (
+            SELECT json_group_array(json_object('speaker', speaker, 'text', text, 'timestamp', ts))
+            FROM (
+                SELECT speaker, text, ts FROM transcript_entries
+                WHERE meeting_id = meetings.id ORDER BY seq
+            )
+        ),
+        'summary', summary,
+        'key_points', json(key_points),
+        'action_items', json(action_items),
+        'decisions', json(decisions),
+        'open_questions', json(open_questions),
+        'participants', json(participants),
+        '_previous_summary', previous_summary,
+        'is_active', json(CASE WHEN is_active THEN 'true' ELSE 'false' END),
+        'agenda', json(agenda)
+    )
+    FROM meetings WHERE id = ?
+"""
+
+
+def get_meeting_json(meeting_id: str) -> Optional[str]:
+    """Get a meeting by ID as a JSON document built by SQLite."""
+    with get_db() as conn:
+        row = conn.execute(_MEETING_JSON_SQL, (meeting_id,)).fetchone()
     
-    return _row_to_dict(row)
+    return row[0] if row else None
+
+
+# Meeting dict keys that map onto a meetings column (JSON-encoded ones first)
+_JSON_COLUMNS = {
+    "key_points": "key_points",
+    "action_items": "action_items",
+    "decisions": "decisions",
+    "open_questions": "open_questions",
+    "participants": "participants",
+    "agenda": "agenda",
+}
+_TEXT_COLUMNS = {
+    "title": "title",
+    "summary": "summary",
+    "_previous_summary": "previous_summary",
+}
+
+# JSON list columns that may receive server-side appends
+_APPENDABLE_COLUMNS = ("key_points", "action_items", "decisions", "participants")
 
 
 def update_meeting(meeting_id: str, data: dict) -> Optional[dict]:
-    """Update a meeting with new data."""
-    now = datetime.now().isoformat()
-    
-    # Serialize JSON fields
-    updates = {
-        "updated_at": now,
-        "title": data.get("title"),
-        "summary": data.get("summary", ""),
-        "transcript": json.dumps(data.get("transcript", [])),
-        "key_points": json.dumps(data.get("key_points", [])),
-        "action_items": json.dumps(data.get("action_items", [])),
-        "decisions": json.dumps(data.get("decisions", [])),
-        "open_questions": json.dumps(data.get("open_questions", [])),
-        "participants": json.dumps(data.get("participants", [])),
-        "previous_summary": data.get("_previous_summary", ""),
-        "agenda": json.dumps(data.get("agenda", [])), # New agenda field
-    }
-    
-    # Build SET clause
-    set_parts = []
-    values = []
-    for key, value in updates.items():
-        if value is not None:
-            set_parts.append(f"{key} = ?")
-            values.append(value)
+    """
+    Update a meeting with new data.
+
+    Only the fields present in data are written. A "transcript" list
+    replaces the stored transcript; an "appends" mapping (as produced by
+    MeetingNoteManager.pop_changes) adds items to the end of list fields.
+    """
+    with get_db() as conn:
+        row = _write_changes(conn, meeting_id, data)
+        if row is None:
+            return None
+        transcript = conn.execute(
+            "SELECT speaker, text, ts FROM transcript_entries WHERE meeting_id = ? ORDER BY seq",
+            (meeting_id,)
+        ).fetchall()
     
-    if not set_parts:
-        return get_meeting(meeting_id)
+    return _row_to_dict(row, transcript)
+
+
+def save_meeting_changes(meeting_id: str, changes: dict) -> bool:
+    """Persist a change set from MeetingNoteManager.pop_changes()."""
+    with get_db() as conn:
+        return _write_changes(conn, meeting_id, changes) is not None
+
+
+def _write_changes(conn: sqlite3.Connection, meeting_id: str, data: dict) -> Optional[sqlite3.Row]:
+    """
+    Write the fields present in data.
+
+    All column changes go into one UPDATE ... RETURNING, so the caller gets
+    the updated row without a second SELECT. Returns None if the meeting
+    is missing.
+    """
+    set_parts = ["updated_at = ?"]
+    values = [now_iso()]
+    for key, column in _TEXT_COLUMNS.items():
+        if data.get(key) is not None:
+            set_parts.append(f"{column} = ?")
+            values.append(data[key])
+    for key, column in _JSON_COLUMNS.items():
+        if data.get(key) is not None:
+            set_parts.append(f"{column} = ?")
+            values.append(_dumps(data[key]))
+    if data.get("transcript") is not None:
+        set_parts.append("transcript_count = ?")
+        values.append(len(data["transcript"]))
     
+    appends = data.get("appends", {})
+    for key, append in appends.items():
+        if key == "transcript":
+            # MAX keeps the count right if a batch is ever written twice
+            set_parts.append("transcript_count = MAX(transcript_count, ?)")
+            values.append(append["start"] + len(append["items"]))
+        elif key == "summary":
+            # Chunks are "\n\n"-separated, including from any existing text
+            text = "\n\n".join(append["items"])
+            if append["start"] > 0:
+                text = "\n\n" + text
+            set_parts.append("summary = summary || ?")
+            values.append(text)
+        elif key in _APPENDABLE_COLUMNS and append["items"]:
+            # json_insert applies its path/value pairs in order, so each
+            # '$[#]' lands after the previous one
+            pairs = ", ".join(["'$[#]', json(?)"] * len(append["items"]))
+            set_parts.append(f"{key} = json_insert({key}, {pairs})")
+            values.extend(_dumps(item) for item in append["items"])
     values.append(meeting_id)
     
-    with get_db() as conn:
-        conn.execute(
-            f"UPDATE meetings SET {', '.join(set_parts)} WHERE id = ?",
-            values
-        )
+    row = conn.execute(
+        f"UPDATE meetings SET {', '.join(set_parts)} WHERE id = ? RETURNING *",
+        values
+    ).fetchone()
+    if row is None:
+        return None
+    
+    if data.get("transcript") is not None:
+        conn.execute("DELETE FROM transcript_entries WHERE meeting_id = ?", (meeting_id,))
+        _insert_transcript_entries(conn, meeting_id, 0, data["transcript"])
+    if "transcript" in appends:
+        append = appends["transcript"]
+        _insert_transcript_entries(conn, meeting_id, append["start"], append["items"])
     
-    return get_meeting(meeting_id)
+    return row
+
+
+def _insert_transcript_entries(conn: sqlite3.Connection, meeting_id: str, start: int, entries: list[dict]):
+    """Insert transcript entries with sequence numbers starting at start."""
+    conn.executemany("""
+        INSERT OR REPLACE INTO transcript_entries (meeting_id, seq, speaker, text, ts)
+        VALUES (?, ?, ?, ?, ?)
+    """, [
+        (meeting_id, seq, entry.get("speaker"), entry.get("text", ""), entry.get("timestamp"))
+        for seq, entry in enumerate(entries, start)
+    ])
 
 
 def set_meeting_active(meeting_id: str, is_active: bool):
@@ -156,21 +429,55 @@ def set_meeting_active(meeting_id: str, is_active: bool):
         )
 
 
-def list_meetings(limit: int = 50, offset: int = 0) -> list[dict]:
-    """List meetings ordered by last updated."""
+def list_meetings(limit: int = 50, before_updated_at: Optional[str] = None) -> list[dict]:
+    """
+    List meetings ordered by last updated.
+
+    Pagination is keyset based: pass the updated_at of the last meeting
+    of one page as before_updated_at to get the next page.
+    """
     with get_db() as conn:
-        rows = conn.execute("""
-            SELECT id, title, created_at, updated_at, 
-                   json_array_length(transcript) as transcript_count,
-                   is_active
+        rows = conn.execute(f"""
+            SELECT id, title, created_at, updated_at, transcript_count, is_active
             FROM meetings
+            {_page_filter(before_updated_at)}
             ORDER BY updated_at DESC
-            LIMIT ? OFFSET ?
-        """, (limit, offset)).fetchall()
+            LIMIT :limit
+        """, {"limit": limit, "before": before_updated_at}).fetchall()
     
     return [dict(row) for row in rows]
 
 
+def list_meetings_json(limit: int = 50, before_updated_at: Optional[str] = None) -> str:
+    """List meetings as a JSON array built by SQLite (see list_meetings)."""
+    with get_db() as conn:
+        row = conn.execute(f"""
+            SELECT COALESCE(json_group_array(json_object(
+                'id', id,
+                'title', title,
+                'created_at', created_at,
+                'updated_at', updated_at,
+                'transcript_count', transcript_count,
+                'is_active', is_active
+            )), '[]')
+            FROM (
+                SELECT id, title, created_at, updated_at, transcript_count, is_active
+                FROM meetings
+                {_page_filter(before_updated_at)}
+                ORDER BY updated_at DESC
+                LIMIT :limit
+            )
+        """, {"limit": limit, "before": before_updated_at}).fetchone()
+    
+    return row[0]
+
+
+def _page_filter(before_updated_at: Optional[str]) -> str:
+    # A plain range condition (rather than "? IS NULL OR ...") lets SQLite
+    # seek idx_meetings_updated straight to the cursor
+    return "WHERE updated_at < :before" if before_updated_at else ""
+
+
 def delete_meeting(meeting_id: str) -> bool:
     """Delete a meeting."""
     with get_db() as conn:
@@ -178,28 +485,37 @@ def delete_meeting(meeting_id: str) -> bool:
             "DELETE FROM meetings WHERE id = ?",
             (meeting_id,)
         )
+        conn.execute(
+            "DELETE FROM transcript_entries WHERE meeting_id = ?",
+            (meeting_id,)
+        )
     return cursor.rowcount > 0
 
 
-def _row_to_dict(row: sqlite3.Row) -> dict:
-    """Convert a database row to a meeting dict."""
+def _dumps(value) -> str:
+    """Encode a value for a JSON text column."""
+    return orjson.dumps(value).decode()
+
+
+def _row_to_dict(row: sqlite3.Row, transcript: list[sqlite3.Row]) -> dict:
+    """Convert a database row and its transcript rows to a meeting dict."""
     return {
         "id": row["id"],
         "title": row["title"],
         "created_at": row["created_at"],
         "updated_at": row["updated_at"],
-        "transcript": json.loads(row["transcript"]),
+        "transcript": [
+            {"speaker": entry["speaker"], "text": entry["text"], "timestamp": entry["ts"]}
+            for entry in transcript
+        ],
         "summary": row["summary"],
-        "key_points": json.loads(row["key_points"]),
-        "action_items": json.loads(row["action_items"]),
-        "decisions": json.loads(row["decisions"]),
-        "open_questions": json.loads(row["open_questions"]),
-        "participants": json.loads(row["participants"]),
+        "key_points": orjson.loads(row["key_points"]),
+        "action_items": orjson.loads(row["action_items"]),
+        "decisions": orjson.loads(row["decisions"]),
+        "open_questions": orjson.loads(row["open_questions"]),
+        "participants": orjson.loads(row["participants"]),
         "_previous_summary": row["previous_summary"],
         "is_active": bool(row["is_active"]),
-        "agenda": json.loads(row["agenda"]), # New: Deserialize agenda
+        "agenda": orjson.loads(row["agenda"]), # New: Deserialize agenda
     }
 
-
-# Initialize database on module import
-init_db()
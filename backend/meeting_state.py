@@ -15,15 +15,19 @@ Edge Case Handling:
 """
 
 import asyncio
-import json
 import os
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from dataclasses import dataclass, field, asdict
-from typing import Optional, Callable
+from typing import Optional, Callable, Iterable, List
 import google.generativeai as genai
+import orjson
 from dotenv import load_dotenv
 from dataclass_wizard import DataclassWizard
-from typing import Optional, Callable, List
+
+from clock import now_iso
 
 load_dotenv()
 
@@ -40,7 +44,7 @@ class MeetingNote:
     """The meeting state that gets pushed to frontend."""
     id: str
     title: str = field(default="Untitled Meeting")
-    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    created_at: str = field(default_factory=now_iso)
     
     # Raw transcript (append-only)
     transcript: list[dict] = field(default_factory=list)
@@ -65,62 +69,38 @@ class MeetingNote:
         return asdict(self)
 
 
-class GeminiProcessor:
-    """
-    Handles Gemini API calls for note generation.
-    
-    Key design: We pass the previous summary and current agenda to maintain context
-    across 30-second intervals, handling incomplete sentences and tracking agenda progress.
-    """
- 
-    def __init__(self):
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY not set in environment")
-        
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel("gemini-2.5-flash")
-    
-    async def process_transcript_batch(
-        self,
-        new_transcript: list[dict],
-        previous_summary: str,
-        current_agenda: List[AgendaItem], # New: current agenda for context
-        full_transcript: list[dict]
-    ) -> dict:
+# MeetingNote lists that only ever grow; changes to these are reported as
+# appends so a save writes just the new items
+APPEND_ONLY_FIELDS = ("transcript", "key_points", "action_items", "decisions", "participants")
 
-        """
-        Process a batch of transcripts and generate/update notes.
-        
-        Args:
-            new_transcript: Latest 30-sec batch of transcript entries
-            previous_summary: Summary from last processing (for context)
-            current_agenda: The current list of agenda items with their completion status
-            full_transcript: Complete transcript so far (for reference)
-        
-        Returns:
-            Structured notes dict with summary, key_points, action_items, etc.,
-            including updated agenda items.
-        """
-        
-        # Format transcript for the prompt
-        transcript_text = self._format_transcript(new_transcript)
 
-        # Format agenda for the prompt
-        agenda_text = self._format_agenda_for_prompt(current_agenda)
-        
-        prompt = f"""You are a meeting note assistant. Analyze the following conversation transcript and generate structured meeting notes.
+@dataclass
+class _ChangeCursor:
+    """Position in a meeting's change history that a consumer has caught up to."""
+    version: int
+    lengths: dict[str, int]
 
-IMPORTANT CONTEXT:
-- This is a CONTINUATION of an ongoing meeting
-- Previous summary (use this to understand incomplete sentences or references): 
-{previous_summary if previous_summary else "This is the start of the meeting."}
 
-CURRENT AGENDA ITEMS (DO NOT CHANGE THESE UNLESS EXPLICITLY DISCUSSED AS COMPLETED OR MOVED ON):
-{agenda_text if agenda_text else "No agenda set."}
+# Body of a reply that opens with a markdown fence (```json ... ```). The
+# greedy body runs to the last closing fence, so backticks inside JSON
+# strings stay part of the body
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*)```", re.S)
 
-NEW TRANSCRIPT TO PROCESS:
-{transcript_text}
+# Keys of Gemini's JSON reply that are merged into the meeting state
+RESULT_KEYS = (
+    "summary",
+    "key_points",
+    "action_items",
+    "decisions",
+    "open_questions",
+    "updated_agenda",
+    "new_agenda_items",
+)
+
+
+# Static instructions, registered once as the model's system instruction so
+# each request only carries the meeting-specific payload below
+SYSTEM_PROMPT = """You are a meeting note assistant. Each message contains the context of an ongoing meeting (the previous summary and the current agenda) followed by a NEW TRANSCRIPT segment. Analyze the segment and generate structured meeting notes.
 
 Based on the NEW TRANSCRIPT, do the following:
 1. Update the status of any agenda items if they were clearly discussed and completed. If an item is completed, mark 'completed: true' and set 'completed_at' to the current timestamp. Do not mark an item as complete if it's only partially discussed or mentioned.
@@ -129,35 +109,35 @@ Based on the NEW TRANSCRIPT, do the following:
 
 Generate meeting notes in the following JSON format. Be concise but capture all important information:
 
-{{
+{
     "summary": "A 2-3 sentence summary of what was discussed in this segment, connecting to previous context if relevant",
     "key_points": [
         "Important point 1",
         "Important point 2"
     ],
     "action_items": [
-        {{"task": "Description of action", "assignee": "Person name or null", "context": "Why this was decided"}}
+        {"task": "Description of action", "assignee": "Person name or null", "context": "Why this was decided"}
     ],
     "decisions": [
-        {{"decision": "What was decided", "rationale": "Why", "participants_involved": ["names"]}}
+        {"decision": "What was decided", "rationale": "Why", "participants_involved": ["names"]}
     ],
     "open_questions": [
         "Unresolved question or topic that needs follow-up"
     ],
     "opinion_changes": [
-        {{"speaker": "name", "from": "previous stance", "to": "new stance", "topic": "what changed"}}
+        {"speaker": "name", "from": "previous stance", "to": "new stance", "topic": "what changed"}
     ],
     "updated_agenda": [
         // Only include agenda items from CURRENT AGENDA ITEMS that have changed their 'completed' status.
         // For new items, suggest them in 'new_agenda_items'
-        // Example for an updated item: {{"id": "agenda-item-id", "text": "Old text if needed", "completed": true, "completed_at": "timestamp"}}
+        // Example for an updated item: {"id": "agenda-item-id", "text": "Old text if needed", "completed": true, "completed_at": "timestamp"}
     ],
     "new_agenda_items": [
         // List any *new* agenda items suggested by the conversation, in text format
         "New topic to add to agenda",
         "Another new item"
     ]
-}}
+}
 
 Rules:
 1. Only include sections that have actual content (empty arrays are fine)
@@ -166,32 +146,97 @@ Rules:
 4. Be specific about WHO said WHAT
 5. For "updated_agenda", ONLY include items from the provided "CURRENT AGENDA ITEMS" that are now clearly completed based on the "NEW TRANSCRIPT". Do NOT include items that are already completed or not discussed as completed.
 6. For "new_agenda_items", list any new topics that arose from the conversation and seem like they should be part of the agenda.
-7. Return ONLY valid JSON, no markdown or explanation.
+7. Return ONLY valid JSON, no markdown or explanation."""
+
+# Per-request prompt pieces, joined around the variable parts
+_PROMPT_PREFIX = """IMPORTANT CONTEXT:
+- This is a CONTINUATION of an ongoing meeting
+- Previous summary (use this to understand incomplete sentences or references): 
+"""
+_PROMPT_NO_SUMMARY = "This is the start of the meeting."
+_PROMPT_AGENDA = """
+
+CURRENT AGENDA ITEMS (DO NOT CHANGE THESE UNLESS EXPLICITLY DISCUSSED AS COMPLETED OR MOVED ON):
+"""
+_PROMPT_NO_AGENDA = "No agenda set."
+_PROMPT_TRANSCRIPT = """
+
+NEW TRANSCRIPT TO PROCESS:
+"""
+_PROMPT_SUFFIX = """
 
 JSON:"""
 
 
+class GeminiProcessor:
+    """
+    Handles Gemini API calls for note generation.
+    
+    Key design: We pass the previous summary and current agenda to maintain context
+    across 30-second intervals, handling incomplete sentences and tracking agenda progress.
+    """
+ 
+    def __init__(self):
+        api_key = os.getenv("GEMINI_API_KEY")
+        if not api_key:
+            raise ValueError("GEMINI_API_KEY not set in environment")
+        
+        genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel(
+            "gemini-2.5-flash",
+            system_instruction=SYSTEM_PROMPT
+        )
+        # Own threads for the blocking SDK call, so a slow Gemini response
+        # can't starve other users of the default executor
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="gemini")
+    
+    async def process_transcript_batch(
+        self,
+        new_transcript: Iterable[dict],
+        previous_summary: str,
+        current_agenda: List[AgendaItem], # New: current agenda for context
+    ) -> dict:
+
+        """
+        Process a batch of transcripts and generate/update notes.
+        
+        Args:
+            new_transcript: Latest 30-sec batch of transcript entries
+            previous_summary: Summary from last processing (for context)
+            current_agenda: The current list of agenda items with their completion status
+        
+        Returns:
+            Structured notes dict with summary, key_points, action_items, etc.,
+            including updated agenda items.
+        """
+        
+        # Copy the agenda so the worker thread sees a stable list
+        agenda = list(current_agenda)
+
         response_text = ""
         try:
             # Run Gemini in executor to not block async loop
             response = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.model.generate_content(prompt)
+                self._executor,
+                lambda: self.model.generate_content(
+                    self._build_prompt(new_transcript, previous_summary, agenda)
+                )
             )
             
             # Parse JSON from response
             response_text = response.text.strip()
             
             # Handle potential markdown code blocks
-            if response_text.startswith("```"):
-                response_text = response_text.split("```")[1]
-                if response_text.startswith("json"):
-                    response_text = response_text[4:]
-                response_text = response_text.strip()
+            fenced = _FENCE_RE.match(response_text)
+            if fenced:
+                response_text = fenced.group(1).strip()
             
-            return json.loads(response_text)
+            # Keep only the keys _merge_result reads so the rest of the
+            # reply (e.g. opinion_changes) is released right away
+            parsed = orjson.loads(response_text)
+            return {key: parsed[key] for key in RESULT_KEYS if key in parsed}
             
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             print(f"Failed to parse Gemini response as JSON: {e}")
             print(f"Response was: {response_text[:500] if response_text else 'empty'}")
             return {
@@ -215,14 +260,30 @@ JSON:"""
                 "new_agenda_items": []
             }
     
-    def _format_transcript(self, transcript: list[dict]) -> str:
+    def _build_prompt(
+        self,
+        new_transcript: Iterable[dict],
+        previous_summary: str,
+        current_agenda: List[AgendaItem],
+    ) -> str:
+        """Assemble the per-batch prompt (runs on the Gemini executor)."""
+        return "".join((
+            _PROMPT_PREFIX,
+            previous_summary or _PROMPT_NO_SUMMARY,
+            _PROMPT_AGENDA,
+            self._format_agenda_for_prompt(current_agenda) or _PROMPT_NO_AGENDA,
+            _PROMPT_TRANSCRIPT,
+            self._format_transcript(new_transcript),
+            _PROMPT_SUFFIX,
+        ))
+
+    def _format_transcript(self, transcript: Iterable[dict]) -> str:
         """Format transcript entries for the prompt."""
-        lines = []
-        for entry in transcript:
-            speaker = entry.get("speaker", "Unknown")
-            text = entry.get("text", "")
-            lines.append(f"[{speaker}]: {text}")
-        return "\n".join(lines)
+        # add_transcript always fills speaker and text
+        return "\n".join(
+            f"[{entry['speaker']}]: {entry['text']}"
+            for entry in transcript
+        )
 
     def _format_agenda_for_prompt(self, agenda: List[AgendaItem]) -> str:
         """Format agenda items for the prompt."""
@@ -242,9 +303,11 @@ class MeetingNoteManager:
     Flow:
     1. Transcripts arrive continuously from Google Speech
     2. They're buffered in _transcript_buffer
-    3. Every PROCESS_INTERVAL seconds, buffer is sent to Gemini
+    3. Every PROCESS_INTERVAL seconds, the buffered lines are flushed to
+       storage via on_flush and then sent to Gemini
     4. Results update the meeting state, including agenda items
-    5. State is broadcast to clients via callback
+    5. The changes since the last broadcast are handed to on_state_update
+       as a delta (see pop_delta) for broadcasting to clients
     """
     
     PROCESS_INTERVAL = 30  # seconds
@@ -252,8 +315,9 @@ class MeetingNoteManager:
     def __init__(
         self,
         meeting_id: str,
-        on_state_update: Optional[Callable[[], None]] = None,
-        initial_state: Optional[dict] = None
+        on_state_update: Optional[Callable[[dict], None]] = None,
+        initial_state: Optional[dict] = None,
+        on_flush: Optional[Callable[[], None]] = None
     ):
         # Load from initial state if provided (for continuing meetings)
         if initial_state:
@@ -273,7 +337,7 @@ class MeetingNoteManager:
             self.meeting = MeetingNote(
                 id=meeting_id,
                 title=initial_state.get("title", "Untitled Meeting"),
-                created_at=initial_state.get("created_at", datetime.now().isoformat()),
+                created_at=initial_state.get("created_at", now_iso()),
                 transcript=initial_state.get("transcript", []),
                 summary=initial_state.get("summary", ""),
                 key_points=initial_state.get("key_points", []),
@@ -289,13 +353,35 @@ class MeetingNoteManager:
             self.meeting = MeetingNote(id=meeting_id)
             print(f"[{meeting_id}] Created new meeting object")
         
-        self._transcript_buffer: list[dict] = []
+        self._transcript_buffer: deque[dict] = deque()
+        
+        # Membership sets mirroring the ordered lists, for O(1) dedup
+        self._participant_set: set[str] = set(self.meeting.participants)
+        self._key_point_set: set[str] = set(self.meeting.key_points)
         self._on_state_update = on_state_update
+        self._on_flush = on_flush
         self._processor: Optional[GeminiProcessor] = None
         self._processing_task: Optional[asyncio.Task] = None
         self._is_running = False
         self._last_process_time: Optional[datetime] = None
         
+        # Each tick's summary is kept as a chunk and joined on demand, instead
+        # of growing one string with += (quadratic over a long meeting)
+        self._summary_chunks: list[str] = [self.meeting.summary] if self.meeting.summary else []
+        self._summary_joined = len(self._summary_chunks)
+        
+        # Change tracking: replaced fields record the version they were last
+        # touched at, append-only fields are compared by length
+        self._version = 0
+        self._field_versions: dict[str, int] = {}
+        self._persisted = self._cursor()
+        self._broadcast = self._cursor()
+        
+        # to_dict()/to_json() results, reused until the state key changes
+        self._snapshot_key: Optional[tuple] = None
+        self._snapshot: dict = {}
+        self._snapshot_json: Optional[str] = None
+        
         # Try to initialize Gemini processor
         try:
             self._processor = GeminiProcessor()
@@ -304,11 +390,146 @@ class MeetingNoteManager:
             print("Meeting notes will only show raw transcript.")
     
     def to_dict(self) -> dict:
-        """Convert meeting state to JSON-serializable dict."""
-        data = asdict(self.meeting)
-        # Remove internal fields
-        data.pop("_previous_summary", None)
-        return data
+        """
+        Convert meeting state to JSON-serializable dict.
+
+        The dict is shallow: lists are the manager's own (internal fields
+        like _previous_summary are left out). Callers must treat it as
+        read-only; it's meant for serializing, not mutating. The same dict
+        is returned until the state changes.
+        """
+        key = self._state_key()
+        if key != self._snapshot_key:
+            self._snapshot = self._build_dict()
+            self._snapshot_json = None
+            self._snapshot_key = key
+        return self._snapshot
+
+    def to_json(self) -> str:
+        """to_dict() encoded as JSON, cached alongside it."""
+        snapshot = self.to_dict()
+        if self._snapshot_json is None:
+            self._snapshot_json = orjson.dumps(snapshot).decode()
+        return self._snapshot_json
+
+    def _build_dict(self) -> dict:
+        self._join_summary()
+        meeting = self.meeting
+        return {
+            "id": meeting.id,
+            "title": meeting.title,
+            "created_at": meeting.created_at,
+            "transcript": meeting.transcript,
+            "summary": meeting.summary,
+            "key_points": meeting.key_points,
+            "action_items": meeting.action_items,
+            "decisions": meeting.decisions,
+            "open_questions": meeting.open_questions,
+            "participants": meeting.participants,
+            "agenda": self._field_value("agenda"),
+        }
+
+    def set_title(self, title: str):
+        """Rename the meeting."""
+        if title != self.meeting.title:
+            self.meeting.title = title
+            self._touch("title")
+
+    def pop_changes(self) -> dict:
+        """
+        Return what changed since the previous call, for persistence.
+
+        Replaced fields map to their new value; append-only lists are
+        reported under "appends" as {"start": index, "items": [...]}.
+        The summary is reported the same way, as new "\n\n"-separated
+        chunks.
+        """
+        changes, cursor = self.pending_changes()
+        self.ack_changes(cursor)
+        return changes
+
+    def pending_changes(self) -> tuple[dict, _ChangeCursor]:
+        """
+        Like pop_changes, but the changes stay pending until
+        ack_changes(cursor) is called, so a save that fails is retried.
+        """
+        return self._changes_since(self._persisted), self._cursor()
+
+    def ack_changes(self, cursor: _ChangeCursor):
+        """Mark the changes returned with cursor as saved."""
+        self._persisted = cursor
+
+    def pop_delta(self) -> dict:
+        """
+        Return what changed since the previous call, for broadcasting.
+
+        Same shape as pop_changes, tracked separately so broadcasts and
+        saves can run on their own schedules. The summary is sent whole and
+        internal fields are left out. Appends carry their start index, so
+        applying one twice (e.g. after a state_sync) is harmless.
+        """
+        cursor = self._cursor()
+        delta = self._changes_since(self._broadcast)
+        self._broadcast = cursor
+        delta.pop("_previous_summary", None)
+        if delta.get("appends", {}).pop("summary", None):
+            self._join_summary()
+            delta["summary"] = self.meeting.summary
+        if not delta.get("appends", True):
+            del delta["appends"]
+        return delta
+
+    def _notify(self):
+        """Pass the changes since the last broadcast to on_state_update."""
+        if self._on_state_update:
+            self._on_state_update(self.pop_delta())
+
+    def _touch(self, *fields: str):
+        """Mark replaced fields as changed."""
+        self._version += 1
+        for name in fields:
+            self._field_versions[name] = self._version
+
+    def _join_summary(self):
+        """Bring meeting.summary up to date with the summary chunks."""
+        if self._summary_joined != len(self._summary_chunks):
+            self.meeting.summary = "\n\n".join(self._summary_chunks)
+            self._summary_joined = len(self._summary_chunks)
+
+    def _appendables(self) -> dict[str, list]:
+        sources = {name: getattr(self.meeting, name) for name in APPEND_ONLY_FIELDS}
+        sources["summary"] = self._summary_chunks
+        return sources
+
+    def _state_key(self) -> tuple:
+        # Every mutation either bumps _version or grows an appendable list
+        return (self._version, *map(len, self._appendables().values()))
+
+    def _cursor(self) -> _ChangeCursor:
+        return _ChangeCursor(
+            version=self._version,
+            lengths={name: len(items) for name, items in self._appendables().items()},
+        )
+
+    def _changes_since(self, cursor: _ChangeCursor) -> dict:
+        changes = {
+            name: self._field_value(name)
+            for name, version in self._field_versions.items()
+            if version > cursor.version
+        }
+        appends = {}
+        for name, items in self._appendables().items():
+            start = cursor.lengths[name]
+            if len(items) > start:
+                appends[name] = {"start": start, "items": items[start:]}
+        if appends:
+            changes["appends"] = appends
+        return changes
+
+    def _field_value(self, name: str):
+        if name == "agenda":
+            return [asdict(item) for item in self.meeting.agenda]
+        return getattr(self.meeting, name)
     
     async def start(self):
         """Start the interval processing loop."""
@@ -354,7 +575,8 @@ class MeetingNoteManager:
         self._transcript_buffer.append(entry)
         
         # Track participants
-        if speaker and speaker not in self.meeting.participants:
+        if speaker and speaker not in self._participant_set:
+            self._participant_set.add(speaker)
             self.meeting.participants.append(speaker)
 
     def add_agenda_item(self, text: str):
@@ -362,8 +584,8 @@ class MeetingNoteManager:
         import uuid
         new_item = AgendaItem(id=f"agenda-{uuid.uuid4().hex[:4]}", text=text, completed=False)
         self.meeting.agenda.append(new_item)
-        if self._on_state_update:
-            self._on_state_update()
+        self._touch("agenda")
+        self._notify()
 
     def update_agenda_item_status(self, item_id: str, completed: bool):
         """Manually update an agenda item's completion status."""
@@ -371,12 +593,12 @@ class MeetingNoteManager:
             if item.id == item_id:
                 item.completed = completed
                 if completed:
-                    item.completed_at = datetime.now().isoformat()
+                    item.completed_at = now_iso()
                 else:
                     item.completed_at = None
+                self._touch("agenda")
                 break
-        if self._on_state_update:
-            self._on_state_update()
+        self._notify()
 
     
     async def _processing_loop(self):
@@ -398,26 +620,28 @@ class MeetingNoteManager:
         if not self._transcript_buffer:
             return
         
+        # Persist the buffered lines before the (slow) Gemini call so a
+        # crash mid-tick doesn't lose them
+        if self._on_flush:
+            self._on_flush()
+        
         # Skip if Gemini not configured
         if not self._processor:
-            print(f"[{datetime.now().isoformat()}] Skipping Gemini processing (not configured)")
-            self._transcript_buffer = []
-            if self._on_state_update:
-                self._on_state_update()
+            print(f"[{now_iso()}] Skipping Gemini processing (not configured)")
+            self._transcript_buffer = deque()
+            self._notify()
             return
         
         # Snapshot and clear buffer (so new transcripts can accumulate)
-        batch = self._transcript_buffer.copy()
-        self._transcript_buffer = []
+        batch, self._transcript_buffer = self._transcript_buffer, deque()
         
-        print(f"[{datetime.now().isoformat()}] Processing {len(batch)} transcript entries...")
+        print(f"[{now_iso()}] Processing {len(batch)} transcript entries...")
         
         # Call Gemini with batch + previous summary for context
         result = await self._processor.process_transcript_batch(
             new_transcript=batch,
             previous_summary=self.meeting._previous_summary,
             current_agenda=self.meeting.agenda, # Pass current agenda
-            full_transcript=self.meeting.transcript
         )
         
         # Update meeting state with Gemini's output
@@ -425,14 +649,14 @@ class MeetingNoteManager:
         
         # Store current summary as context for next batch
         self.meeting._previous_summary = result.get("summary", "")
+        self._touch("_previous_summary")
         
         self._last_process_time = datetime.now()
         
         # Notify clients of state change (sync callback)
-        if self._on_state_update:
-            self._on_state_update()
+        self._notify()
         
-        print(f"[{datetime.now().isoformat()}] Processing complete. Summary: {result.get('summary', '')[:100]}...")
+        print(f"[{now_iso()}] Processing complete. Summary: {result.get('summary', '')[:100]}...")
     
     def _merge_result(self, result: dict):
         """Merge Gemini's output into meeting state. including agenda."""
@@ -440,14 +664,13 @@ class MeetingNoteManager:
         # Update summary (cumulative - append to build full meeting summary)
         new_summary = result.get("summary", "")
         if new_summary:
-            if self.meeting.summary:
-                self.meeting.summary += "\n\n" + new_summary
-            else:
-                self.meeting.summary = new_summary
+            self._summary_chunks.append(new_summary)
         
-        # Append key points (deduplicated)
+        # Append key points (deduplicated); anything but a string, e.g. a
+        # dict Gemini returns by mistake, can't go in the set and is skipped
         for point in result.get("key_points", []):
-            if point and point not in self.meeting.key_points:
+            if point and isinstance(point, str) and point not in self._key_point_set:
+                self._key_point_set.add(point)
                 self.meeting.key_points.append(point)
         
         # Append action items
@@ -462,9 +685,11 @@ class MeetingNoteManager:
         
         # Update open questions (can be resolved, so replace)
         new_questions = result.get("open_questions", [])
-        if new_questions:
+        # Gemini often repeats the same list; only a real change is saved
+        if new_questions and new_questions != self.meeting.open_questions:
             # Keep questions that weren't answered, add new ones
             self.meeting.open_questions = new_questions
+            self._touch("open_questions")
 
 
         # --- Handle Agenda Updates ---
@@ -481,7 +706,8 @@ class MeetingNoteManager:
                         # Only update if Gemini explicitly says it's completed and it wasn't already
                         if completed is True and existing_item.completed is False:
                             existing_item.completed = True
-                            existing_item.completed_at = completed_at if completed_at else datetime.now().isoformat()
+                            existing_item.completed_at = completed_at if completed_at else now_iso()
+                            self._touch("agenda")
                             print(f"[{self.meeting.id}] Agenda item '{existing_item.text}' marked as completed by AI.")
                         break
         
@@ -493,14 +719,11 @@ class MeetingNoteManager:
                 import uuid
                 new_item = AgendaItem(id=f"agenda-{uuid.uuid4().hex[:4]}", text=new_item_text, completed=False)
                 self.meeting.agenda.append(new_item)
+                self._touch("agenda")
                 print(f"[{self.meeting.id}] New agenda item added by AI: '{new_item_text}'")
 
         # Opinion changes are noted in decisions/key_points, no separate tracking needed
 
 
-        
-        # Opinion changes are noted in decisions/key_points, no separate tracking needed
-
-
 # For backward compatibility with server.py imports
 __all__ = ["MeetingNote", "MeetingNoteManager", "GeminiProcessor", "AgendaItem"]
@@ -9,12 +9,12 @@ Features:
 """
 
 import asyncio
-import json
 import base64
 import os
 import queue
 import threading
-from datetime import datetime
+from collections import deque
+from concurrent.futures import Future
 from typing import Optional
 from contextlib import asynccontextmanager
 from pathlib import Path
@@ -22,12 +22,14 @@ from pathlib import Path
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
 from google.cloud import speech
 from google.oauth2 import service_account
 from dotenv import load_dotenv
+import orjson
 
-from meeting_state import MeetingNoteManager, MeetingNote, AgendaItem
+from meeting_state import MeetingNoteManager, MeetingNote, AgendaItem, APPEND_ONLY_FIELDS
+from clock import now_iso
 import database as db
 
 load_dotenv(dotenv_path=Path(__file__).parent.parent / ".env")
@@ -35,17 +37,74 @@ load_dotenv(dotenv_path=Path(__file__).parent.parent / ".env")
 # Audio parameters
 SAMPLE_RATE = 16000
 
+# Stack size for the per-meeting Speech thread. The default (8MB on most
+# Linux systems) is far more than the gRPC streaming call needs, but it
+# still has to fit SSL/auth calls made during token refresh.
+SPEECH_THREAD_STACK_SIZE = 512 * 1024
+
 
 def get_credentials() -> service_account.Credentials:
     """Decode base64 credentials from environment."""
     creds_base64 = os.getenv("GOOGLE_CREDENTIALS_BASE64")
     if not creds_base64:
         raise ValueError("GOOGLE_CREDENTIALS_BASE64 not set")
-    creds_json = base64.b64decode(creds_base64).decode("utf-8")
-    creds_info = json.loads(creds_json)
+    # orjson parses the decoded bytes directly; no utf-8 str in between
+    creds_info = orjson.loads(base64.b64decode(creds_base64))
     return service_account.Credentials.from_service_account_info(creds_info)
 
 
+def _dumps(obj) -> str:
+    """Encode a WebSocket message as JSON text."""
+    return orjson.dumps(obj).decode()
+
+
+# Shared by every meeting: the client is safe to use for concurrent
+# streams, and building it decodes the credentials and sets up a channel
+_speech_client: Optional[speech.SpeechClient] = None
+_speech_client_lock = threading.Lock()
+
+
+def get_speech_client() -> speech.SpeechClient:
+    """Get the process-wide Speech client, creating it on first use."""
+    global _speech_client
+    with _speech_client_lock:
+        if _speech_client is None:
+            _speech_client = speech.SpeechClient(credentials=get_credentials())
+        return _speech_client
+
+
+# The recognition settings are the same for every meeting
+STREAMING_CONFIG = speech.StreamingRecognitionConfig(
+    config=speech.RecognitionConfig(
+        encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
+        sample_rate_hertz=SAMPLE_RATE,
+        language_code="en-US",
+        enable_automatic_punctuation=True,
+        diarization_config=speech.SpeakerDiarizationConfig(
+            enable_speaker_diarization=True,
+            min_speaker_count=1,
+            max_speaker_count=4
+        )
+    ),
+    interim_results=True,
+)
+
+
+class AudioQueue(queue.Queue):
+    """Audio frames for a meeting's Speech stream, with put-back."""
+
+    def unget(self, item):
+        """Return an item to the front, so the next get() sees it first."""
+        with self.not_empty:
+            self.queue.appendleft(item)
+            self.unfinished_tasks += 1
+            self.not_empty.notify()
+
+
+# Wakes a retired stream's request generator; live generators skip it
+_STREAM_RETIRED = object()
+
+
 # Store active meetings in memory
 active_meetings: dict[str, "MeetingSession"] = {}
 
@@ -53,74 +112,279 @@ active_meetings: dict[str, "MeetingSession"] = {}
 class MeetingSession:
     """Manages a single meeting session."""
 
-    def __init__(self, meeting_id: str, loop: asyncio.AbstractEventLoop):
+    # While streaming, saves are coalesced and written at most this often
+    FLUSH_INTERVAL = 0.5
+    # Interims are superseded by the next one, so only a few are kept and
+    # at most one is sent per debounce window
+    INTERIM_QUEUE_SIZE = 32
+    INTERIM_DEBOUNCE = 0.08
+    # Audio goes to Google in ~100ms requests (16kHz LINEAR16); a timer
+    # sends any shorter tail so it isn't held back indefinitely
+    AUDIO_FRAME_BYTES = 3200
+    AUDIO_FLUSH_DELAY = 0.15
+    # Live updates are deltas; a full state_sync this often while
+    # streaming lets a client that missed one catch up
+    STATE_SYNC_INTERVAL = 30
+
+    def __init__(self, meeting_id: str, loop: asyncio.AbstractEventLoop, existing: Optional[dict]):
         self.meeting_id = meeting_id
         self.loop = loop
-        self.clients: list[WebSocket] = []
-        self.audio_queue: queue.Queue[bytes | None] = queue.Queue()
+        self.clients: set[WebSocket] = set()
+        self.audio_queue: AudioQueue = AudioQueue()
+        # Bumped whenever a Speech stream ends; a request generator from an
+        # older stream must not take audio meant for the current one
+        self._stream_id = 0
         self.is_streaming = False
         self._stream_thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._audio_buffer = bytearray()
+        self._audio_flush: Optional[asyncio.TimerHandle] = None
+        self._dirty = False
+        self._save_future: Optional[Future] = None
+        self._save_again = False
+        self._flush_task: Optional[asyncio.Task] = None
+        self._interim_queue: asyncio.Queue[tuple[str, Optional[str]]] = asyncio.Queue(
+            maxsize=self.INTERIM_QUEUE_SIZE
+        )
+        self._interim_task: Optional[asyncio.Task] = None
+        self._sync_task: Optional[asyncio.Task] = None
+        # Outgoing broadcasts, sent one at a time in the order posted
+        self._outbox: deque[tuple[str, asyncio.Future]] = deque()
+        self._sender: Optional[asyncio.Task] = None
+        self._finals_seen = 0
         
-        # Load existing meeting or create new
-        existing = db.get_meeting(meeting_id)
+        # Continue the stored meeting, or start fresh (see open())
         if existing:
             self.note_manager = MeetingNoteManager(
                 meeting_id=meeting_id,
                 on_state_update=self._on_update,
-                initial_state=existing
+                initial_state=existing,
+                on_flush=self.persist
             )
             print(f"[{meeting_id}] Loaded existing meeting: {existing['title']}")
         else:
-            db.create_meeting(meeting_id)
             self.note_manager = MeetingNoteManager(
                 meeting_id=meeting_id,
-                on_state_update=self._on_update
+                on_state_update=self._on_update,
+                on_flush=self.persist
             )
             print(f"[{meeting_id}] Created new meeting")
 
-    def _on_update(self):
+    @classmethod
+    async def open(cls, meeting_id: str, loop: asyncio.AbstractEventLoop) -> "MeetingSession":
+        """Load the meeting, creating it if needed, without blocking the loop."""
+        existing, created = await db.run_write(db.get_or_create_meeting, meeting_id)
+        return cls(meeting_id, loop, None if created else existing)
+
+    def persist(self) -> Optional[Future]:
+        """
+        Queue whatever changed since the last save on the DB writer thread.
+
+        One save is in flight at a time, and the change cursor only moves
+        once it commits: a failed save leaves its changes pending for the
+        next one. Returns the in-flight save, if any.
+        """
+        if self._save_future:
+            self._save_again = True
+            return self._save_future
+        changes, cursor = self.note_manager.pending_changes()
+        if not changes:
+            return None
+        future = db.submit_write(db.save_meeting_changes, self.meeting_id, changes)
+        self._save_future = future
+        # Registered before any wrap_future() waiter, so the cursor is
+        # settled by the time a caller's await returns
+        future.add_done_callback(
+            lambda f: self.loop.call_soon_threadsafe(self._save_done, f, cursor)
+        )
+        return future
+
+    def _save_done(self, future: Future, cursor):
+        """Settle a finished save (loop thread)."""
+        self._save_future = None
+        if future.exception():
+            print(f"[{self.meeting_id}] Failed to save meeting: {future.exception()}")
+            # Unsaved changes are still pending; the flusher (or the next
+            # change) retries them
+            self._dirty = True
+            return
+        self.note_manager.ack_changes(cursor)
+        if self._save_again:
+            self._save_again = False
+            self.persist()
+
+    async def save_now(self):
+        """Save everything pending and wait until it has committed."""
+        while (pending := self.persist()) is not None:
+            await asyncio.wrap_future(pending)
+
+    def _schedule_save(self):
+        """Save now, or on the next flush while streaming."""
+        if self._flush_task:
+            self._dirty = True
+        else:
+            self.persist()
+
+    async def _flusher(self):
+        """Background loop that saves pending changes every FLUSH_INTERVAL seconds."""
+        while True:
+            try:
+                await asyncio.sleep(self.FLUSH_INTERVAL)
+                if self._dirty:
+                    self._dirty = False
+                    await self.save_now()
+            except asyncio.CancelledError:
+                break
+            except Exception:
+                # Already logged by _save_done
+                pass
+
+    def _on_update(self, delta: dict):
         """Called when meeting state changes - save and broadcast."""
-        # Save to database
-        db.update_meeting(self.meeting_id, self.note_manager.to_dict())
-        # Broadcast to clients
-        asyncio.run_coroutine_threadsafe(self.broadcast_state(), self.loop)
+        # The delta has already been popped, so on the loop thread it is
+        # posted right away; a queued callback could let a later delta
+        # overtake it. Other threads hand it over with call_soon_threadsafe
+        try:
+            on_loop = asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            on_loop = False
+        if on_loop:
+            self._apply_update(delta)
+        else:
+            self.loop.call_soon_threadsafe(self._apply_update, delta)
+
+    def _apply_update(self, delta: dict):
+        """Schedule the save and broadcast for a state change (loop thread)."""
+        self._schedule_save()
+        if delta:
+            # Posted now, not from a task, so it keeps its place ahead of
+            # any delta popped after it
+            self._post({"type": "state_delta", "delta": delta})
 
     async def add_client(self, websocket: WebSocket):
         """Add a client and send current state."""
-        self.clients.append(websocket)
-        await websocket.send_json({
-            "type": "state_sync",
-            "meeting": self.note_manager.to_dict()
-        })
+        self.clients.add(websocket)
+        await websocket.send_text(self.state_message("state_sync"))
 
     def remove_client(self, websocket: WebSocket):
-        if websocket in self.clients:
-            self.clients.remove(websocket)
+        self.clients.discard(websocket)
 
     async def broadcast_state(self):
         """Push updated meeting state to all clients."""
-        state = {"type": "state_update", "meeting": self.note_manager.to_dict()}
-        disconnected = []
-        for client in self.clients:
-            try:
-                await client.send_json(state)
-            except Exception:
-                disconnected.append(client)
-        for client in disconnected:
-            self.remove_client(client)
+        await self._post(self.state_message("state_update"))
+
+    async def broadcast_delta(self, delta: Optional[dict] = None):
+        """Push only what changed since the last broadcast to all clients."""
+        if delta is None:
+            delta = self.note_manager.pop_delta()
+        if not delta:
+            return
+        await self._post({"type": "state_delta", "delta": delta})
 
     async def broadcast_interim(self, text: str, speaker: Optional[str]):
         """Send interim transcript to all clients."""
-        message = {"type": "interim_transcript", "text": text, "speaker": speaker}
-        for client in self.clients:
+        await self._post({"type": "interim_transcript", "text": text, "speaker": speaker})
+
+    async def _state_syncer(self):
+        """Background loop that resends the full state every STATE_SYNC_INTERVAL seconds."""
+        while True:
             try:
-                await client.send_json(message)
-            except Exception:
-                pass
+                await asyncio.sleep(self.STATE_SYNC_INTERVAL)
+                await self._post(self.state_message("state_sync"))
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                print(f"[{self.meeting_id}] State sync error: {e}")
+
+    def _queue_interim(self, text: str, speaker: Optional[str]):
+        """Queue an interim transcript, dropping the oldest if full (loop thread only)."""
+        if self._interim_queue.full():
+            self._interim_queue.get_nowait()
+        self._interim_queue.put_nowait((text, speaker))
+
+    async def _interim_drainer(self):
+        """Background loop that broadcasts the latest interim once per debounce window."""
+        while True:
+            try:
+                text, speaker = await self._interim_queue.get()
+                finals_seen = self._finals_seen
+                await asyncio.sleep(self.INTERIM_DEBOUNCE)
+                if not self._interim_queue.empty():
+                    while not self._interim_queue.empty():
+                        text, speaker = self._interim_queue.get_nowait()
+                elif finals_seen != self._finals_seen:
+                    # A final result replaced this interim while we waited
+                    continue
+                await self.broadcast_interim(text, speaker)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                print(f"[{self.meeting_id}] Interim broadcast error: {e}")
+
+    def state_message(self, kind: str) -> str:
+        """Build a full-state event around the manager's cached JSON."""
+        return f'{{"type":"{kind}","meeting":{self.note_manager.to_json()}}}'
+
+    def _post(self, message: dict | str) -> asyncio.Future:
+        """
+        Queue a message (dict, or already-encoded text) for all clients.
+
+        Messages go out one at a time in the order they were posted, so a
+        delta produced earlier can never arrive after a later one. The
+        returned future resolves once this message has been sent.
+        """
+        sent = self.loop.create_future()
+        if not self.clients:
+            sent.set_result(None)
+            return sent
+        payload = message if isinstance(message, str) else _dumps(message)
+        self._outbox.append((payload, sent))
+        if self._sender is None or self._sender.done():
+            self._sender = self.loop.create_task(self._drain_outbox())
+        return sent
+
+    async def _drain_outbox(self):
+        """Send queued messages in order until the outbox is empty."""
+        while self._outbox:
+            payload, sent = self._outbox.popleft()
+            try:
+                await self._send_all(payload)
+            finally:
+                if not sent.done():
+                    sent.set_result(None)
+
+    async def _send_all(self, payload: str):
+        """Send an already-encoded message to all clients concurrently."""
+        clients = list(self.clients)
+        results = await asyncio.gather(
+            *(client.send_text(payload) for client in clients),
+            return_exceptions=True
+        )
+        for client, result in zip(clients, results):
+            if isinstance(result, Exception):
+                self.remove_client(client)
 
     def process_audio_chunk(self, chunk: bytes):
-        """Queue audio chunk."""
-        self.audio_queue.put(chunk)
+        """Buffer an audio chunk and queue it once a full frame is ready."""
+        if not self._audio_buffer and len(chunk) >= self.AUDIO_FRAME_BYTES:
+            # Already a full frame (the browser client sends 256ms): hand
+            # Starlette's bytes straight on instead of copying them twice
+            self.audio_queue.put(chunk)
+            return
+        self._audio_buffer += chunk
+        if len(self._audio_buffer) >= self.AUDIO_FRAME_BYTES:
+            self._flush_audio()
+        elif self._audio_flush is None:
+            self._audio_flush = self.loop.call_later(self.AUDIO_FLUSH_DELAY, self._flush_audio)
+
+    def _flush_audio(self):
+        """Queue whatever audio is buffered as one request."""
+        if self._audio_flush:
+            self._audio_flush.cancel()
+            self._audio_flush = None
+        if self._audio_buffer:
+            self.audio_queue.put(bytes(self._audio_buffer))
+            self._audio_buffer.clear()
 
     async def start_streaming(self):
         """Start Google Speech streaming and Gemini processing."""
@@ -128,17 +392,29 @@ class MeetingSession:
             return
         
         self.is_streaming = True
-        db.set_meeting_active(self.meeting_id, True)
+        self._stopped.clear()
+        # Fresh queue: nothing left over (e.g. the last stop's None) from a
+        # previous recording
+        self.audio_queue = AudioQueue()
+        await db.run_write(db.set_meeting_active, self.meeting_id, True)
         
-        # Start Gemini processing loop
+        # Start Gemini processing loop and the save flusher
         await self.note_manager.start()
+        self._flush_task = asyncio.create_task(self._flusher())
+        self._interim_task = asyncio.create_task(self._interim_drainer())
+        self._sync_task = asyncio.create_task(self._state_syncer())
         
-        # Start Speech API thread
-        self._stream_thread = threading.Thread(
-            target=self._run_speech_streaming,
-            daemon=True
-        )
-        self._stream_thread.start()
+        # Start Speech API thread. stack_size() is process-wide and only
+        # read when a thread starts, so restore it right after.
+        previous_stack_size = threading.stack_size(SPEECH_THREAD_STACK_SIZE)
+        try:
+            self._stream_thread = threading.Thread(
+                target=self._run_speech_streaming,
+                daemon=True
+            )
+            self._stream_thread.start()
+        finally:
+            threading.stack_size(previous_stack_size)
         
         print(f"[{self.meeting_id}] Streaming started")
 
@@ -148,10 +424,12 @@ class MeetingSession:
             return
             
         self.is_streaming = False
-        db.set_meeting_active(self.meeting_id, False)
+        await db.run_write(db.set_meeting_active, self.meeting_id, False)
         print(f"[{self.meeting_id}] Stopping streaming...")
         
-        # Signal audio generator to stop
+        # Signal audio generator and the retry wait to stop
+        self._stopped.set()
+        self._flush_audio()
         self.audio_queue.put(None)
         
         if self._stream_thread:
@@ -160,52 +438,56 @@ class MeetingSession:
         # Final processing
         await self.note_manager.stop()
         
+        for task in (self._interim_task, self._sync_task):
+            if task:
+                task.cancel()
+        self._interim_task = self._sync_task = None
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        
         # Save final state
-        db.update_meeting(self.meeting_id, self.note_manager.to_dict())
+        await self.save_now()
         
-        await self.broadcast_state()
+        await self.broadcast_delta()
         print(f"[{self.meeting_id}] Streaming stopped and saved")
 
     def _run_speech_streaming(self):
         """Run Google Speech API streaming in thread."""
-        credentials = get_credentials()
-        client = speech.SpeechClient(credentials=credentials)
-
-        diarization_config = speech.SpeakerDiarizationConfig(
-            enable_speaker_diarization=True,
-            min_speaker_count=1,
-            max_speaker_count=4
-        )
-
-        config = speech.RecognitionConfig(
-            encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
-            sample_rate_hertz=SAMPLE_RATE,
-            language_code="en-US",
-            enable_automatic_punctuation=True,
-            diarization_config=diarization_config
-        )
-
-        streaming_config = speech.StreamingRecognitionConfig(
-            config=config,
-            interim_results=True,
-        )
-
-        def audio_generator():
-            while self.is_streaming:
-                try:
-                    chunk = self.audio_queue.get(timeout=0.1)
-                    if chunk is None:
-                        break
-                    yield speech.StreamingRecognizeRequest(audio_content=chunk)
-                except queue.Empty:
-                    continue
+        client = get_speech_client()
+
+        def audio_generator(stream_id: int):
+            # Blocks until audio arrives; stop_streaming wakes it with None.
+            # Lookups are bound once, outside the per-chunk loop.
+            request = speech.StreamingRecognizeRequest
+            audio_queue = self.audio_queue
+            get = audio_queue.get
+            while True:
+                chunk = get()
+                if chunk is _STREAM_RETIRED:
+                    if stream_id != self._stream_id:
+                        return
+                    continue  # meant for an older generator
+                if stream_id != self._stream_id:
+                    # gRPC left this generator blocked in get() after its
+                    # stream ended: hand the frame (or None) to the new one
+                    audio_queue.unget(chunk)
+                    return
+                if chunk is None:
+                    break
+                yield request(audio_content=chunk)
 
         while self.is_streaming:
+            failed = False
             try:
                 print(f"[{self.meeting_id}] Starting Speech API stream...")
                 responses = client.streaming_recognize(
-                    config=streaming_config,
-                    requests=audio_generator()
+                    config=STREAMING_CONFIG,
+                    requests=audio_generator(self._stream_id)
                 )
                 
                 for response in responses:
@@ -233,9 +515,9 @@ class MeetingSession:
                             self.loop
                         )
                     else:
-                        asyncio.run_coroutine_threadsafe(
-                            self.broadcast_interim(transcript, speaker),
-                            self.loop
+                        # No Future or Task per interim; the drainer sends them
+                        self.loop.call_soon_threadsafe(
+                            self._queue_interim, transcript, speaker
                         )
                         
             except Exception as e:
@@ -246,26 +528,37 @@ class MeetingSession:
                     print(f"[{self.meeting_id}] Google 5-min limit, restarting...")
                 else:
                     print(f"[{self.meeting_id}] Speech API error: {e}")
-                import time
-                time.sleep(0.5)
+                failed = True
+            finally:
+                # Retire this stream's generator right away, so audio sent
+                # from here on waits for the next stream
+                self._stream_id += 1
+                self.audio_queue.put(_STREAM_RETIRED)
+            if failed:
+                # Back off before reconnecting, but wake at once on stop
+                self._stopped.wait(0.5)
 
         print(f"[{self.meeting_id}] Speech streaming thread ended")
 
     async def _handle_final_transcript(self, transcript: str, speaker: Optional[str]):
         """Handle final transcript result."""
+        # Finals skip the interim debounce; anything still queued is older
+        self._finals_seen += 1
+        while not self._interim_queue.empty():
+            self._interim_queue.get_nowait()
         await self.note_manager.add_transcript(
             text=transcript,
             speaker=speaker,
-            timestamp=datetime.now().isoformat()
+            timestamp=now_iso()
         )
-        # Save incrementally
-        db.update_meeting(self.meeting_id, self.note_manager.to_dict())
-        await self.broadcast_state()
+        self._schedule_save()
+        await self.broadcast_delta()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Cleanup on shutdown."""
+    """Set up the database on startup, clean up on shutdown."""
+    db.init_db()
     yield
     for session in active_meetings.values():
         await session.stop_streaming()
@@ -294,9 +587,10 @@ async def root():
 
 
 @app.get("/api/meetings")
-async def list_meetings(limit: int = 50, offset: int = 0):
-    """List all meetings."""
-    return db.list_meetings(limit, offset)
+async def list_meetings(limit: int = 50, before: Optional[str] = None):
+    """List meetings, newest first. Pass the last item's updated_at as `before` for the next page."""
+    meetings_json = await db.run_read(db.list_meetings_json, limit, before)
+    return Response(content=meetings_json, media_type="application/json")
 
 
 @app.post("/api/meetings")
@@ -306,22 +600,69 @@ async def create_meeting(data: Optional[dict] = None):
     meeting_id = f"meeting-{uuid.uuid4().hex[:8]}"
     title = data.get("title", "Untitled Meeting") if data else "Untitled Meeting"
     initial_agenda = data.get("agenda") if data else None # Pass initial agenda
-    return db.create_meeting(meeting_id, title, initial_agenda)
+    return await db.run_write(db.create_meeting, meeting_id, title, initial_agenda)
 
 
 @app.get("/api/meetings/{meeting_id}")
 async def get_meeting(meeting_id: str):
     """Get a specific meeting."""
-    meeting = db.get_meeting(meeting_id)
-    if not meeting:
+    meeting_json = await db.run_read(db.get_meeting_json, meeting_id)
+    if not meeting_json:
         raise HTTPException(status_code=404, detail="Meeting not found")
-    return meeting
+    return Response(content=meeting_json, media_type="application/json")
+
+
+# Fields a client may set through PUT /api/meetings/{id}: (type, item type
+# for lists). Server-only keys such as "appends" and "_previous_summary"
+# are rejected
+EDITABLE_MEETING_FIELDS = {
+    "title": (str, None),
+    "summary": (str, None),
+    "key_points": (list, str),
+    "action_items": (list, dict),
+    "decisions": (list, dict),
+    "open_questions": (list, str),
+    "participants": (list, str),
+    "agenda": (list, dict),
+    "transcript": (list, dict),
+}
+
+
+def _check_meeting_update(data: dict):
+    """Reject unknown keys and badly shaped values with a 422."""
+    unknown = sorted(set(data) - EDITABLE_MEETING_FIELDS.keys())
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Fields not editable: {', '.join(unknown)}")
+    for key, value in data.items():
+        kind, item_kind = EDITABLE_MEETING_FIELDS[key]
+        if not isinstance(value, kind) or (
+            item_kind and not all(isinstance(item, item_kind) for item in value)
+        ):
+            expected = f"list of {item_kind.__name__}" if item_kind else kind.__name__
+            raise HTTPException(status_code=422, detail=f"'{key}' must be a {expected}")
+    for item in data.get("agenda", ()):
+        if not (isinstance(item.get("id"), str) and isinstance(item.get("text"), str)):
+            raise HTTPException(status_code=422, detail="Agenda items need string 'id' and 'text'")
+
+
+# Fields a live session extends by appending (and saves as deltas against
+# what it has already written), so replacing them from outside would leave
+# the stored meeting mixing two histories
+SESSION_TRACKED_FIELDS = frozenset(APPEND_ONLY_FIELDS) | {"summary"}
 
 
 @app.put("/api/meetings/{meeting_id}")
 async def update_meeting(meeting_id: str, data: dict):
-    """Update a meeting."""
-    meeting = db.update_meeting(meeting_id, data)
+    """Update a meeting's user-editable fields."""
+    _check_meeting_update(data)
+    if meeting_id in active_meetings:
+        tracked = sorted(SESSION_TRACKED_FIELDS.intersection(data))
+        if tracked:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Fields cannot be edited while the meeting is active: {', '.join(tracked)}",
+            )
+    meeting = await db.run_write(db.update_meeting, meeting_id, data)
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
     
@@ -339,7 +680,7 @@ async def delete_meeting(meeting_id: str):
         await active_meetings[meeting_id].stop_streaming()
         del active_meetings[meeting_id]
     
-    if not db.delete_meeting(meeting_id):
+    if not await db.run_write(db.delete_meeting, meeting_id):
         raise HTTPException(status_code=404, detail="Meeting not found")
     
     return {"status": "deleted"}
@@ -351,19 +692,19 @@ async def update_agenda_item_status(meeting_id: str, item_id: str, data: dict):
     session = active_meetings.get(meeting_id)
     if not session:
         # Load from DB if not active, update, then save
-        meeting_data = db.get_meeting(meeting_id)
+        meeting_data = await db.run_read(db.get_meeting, meeting_id)
         if not meeting_data:
             raise HTTPException(status_code=404, detail="Meeting not found")
         
         # Create a temporary manager to update agenda
         temp_manager = MeetingNoteManager(meeting_id=meeting_id, initial_state=meeting_data)
         temp_manager.update_agenda_item_status(item_id, data.get("completed", False))
-        db.update_meeting(meeting_id, temp_manager.to_dict())
+        await db.run_write(db.save_meeting_changes, meeting_id, temp_manager.pop_changes())
         # No broadcast needed if not active
         return {"status": "success", "meeting": temp_manager.to_dict()}
     
+    # The manager's on_state_update callback broadcasts the change
     session.note_manager.update_agenda_item_status(item_id, data.get("completed", False))
-    await session.broadcast_state()
     return {"status": "success", "meeting": session.note_manager.to_dict()}
 
 # New API endpoint for adding an agenda item
@@ -377,22 +718,46 @@ async def add_agenda_item(meeting_id: str, data: dict):
     session = active_meetings.get(meeting_id)
     if not session:
         # Load from DB if not active, add, then save
-        meeting_data = db.get_meeting(meeting_id)
+        meeting_data = await db.run_read(db.get_meeting, meeting_id)
         if not meeting_data:
             raise HTTPException(status_code=404, detail="Meeting not found")
         
         temp_manager = MeetingNoteManager(meeting_id=meeting_id, initial_state=meeting_data)
         temp_manager.add_agenda_item(text)
-        db.update_meeting(meeting_id, temp_manager.to_dict())
+        await db.run_write(db.save_meeting_changes, meeting_id, temp_manager.pop_changes())
         return {"status": "success", "meeting": temp_manager.to_dict()}
     
+    # The manager's on_state_update callback broadcasts the change
     session.note_manager.add_agenda_item(text)
-    await session.broadcast_state()
     return {"status": "success", "meeting": session.note_manager.to_dict()}
 
 
 # ============ WebSocket ============
 
+async def _start_recording(session: MeetingSession, websocket: WebSocket, data: dict):
+    await session.start_streaming()
+    await websocket.send_text(_dumps({"type": "recording_started"}))
+
+
+async def _stop_recording(session: MeetingSession, websocket: WebSocket, data: dict):
+    await session.stop_streaming()
+    await websocket.send_text(session.state_message("recording_stopped"))
+
+
+async def _update_title(session: MeetingSession, websocket: WebSocket, data: dict):
+    session.note_manager.set_title(data.get("title", ""))
+    session.persist()
+    await session.broadcast_delta()
+
+
+# Client → server commands, by "type"
+COMMAND_HANDLERS = {
+    "start_recording": _start_recording,
+    "stop_recording": _stop_recording,
+    "update_title": _update_title,
+}
+
+
 @app.websocket("/ws/meeting/{meeting_id}")
 async def websocket_meeting(websocket: WebSocket, meeting_id: str):
     """WebSocket endpoint for meeting audio streaming."""
@@ -401,10 +766,11 @@ async def websocket_meeting(websocket: WebSocket, meeting_id: str):
     loop = asyncio.get_event_loop()
     
     # Get or create session
-    if meeting_id not in active_meetings:
-        active_meetings[meeting_id] = MeetingSession(meeting_id, loop)
-    
-    session = active_meetings[meeting_id]
+    session = active_meetings.get(meeting_id)
+    if session is None:
+        session = await MeetingSession.open(meeting_id, loop)
+        # Another client may have opened it while we waited on the DB
+        session = active_meetings.setdefault(meeting_id, session)
     await session.add_client(websocket)
     
     try:
@@ -417,32 +783,22 @@ async def websocket_meeting(websocket: WebSocket, meeting_id: str):
                     break
                 raise
             
-            # Check for disconnect message
-            if message.get("type") == "websocket.disconnect":
-                break
+            # Audio frames are the bulk of the traffic, so check them first;
+            # disconnect messages never carry bytes
+            chunk = message.get("bytes")
+            if chunk is not None:
+                session.process_audio_chunk(chunk)
+                continue
             
-            if "bytes" in message:
-                session.process_audio_chunk(message["bytes"])
+            if message["type"] == "websocket.disconnect":
+                break
             
-            elif "text" in message:
-                data = json.loads(message["text"])
-                command = data.get("type")
-                
-                if command == "start_recording":
-                    await session.start_streaming()
-                    await websocket.send_json({"type": "recording_started"})
-                
-                elif command == "stop_recording":
-                    await session.stop_streaming()
-                    await websocket.send_json({
-                        "type": "recording_stopped",
-                        "meeting": session.note_manager.to_dict()
-                    })
-                
-                elif command == "update_title":
-                    session.note_manager.meeting.title = data.get("title", "")
-                    db.update_meeting(meeting_id, session.note_manager.to_dict())
-                    await session.broadcast_state()
+            text = message.get("text")
+            if text is not None:
+                data = orjson.loads(text)
+                handler = COMMAND_HANDLERS.get(data.get("type"))
+                if handler:
+                    await handler(session, websocket, data)
 
     except WebSocketDisconnect:
         pass
@@ -453,4 +809,5 @@ async def websocket_meeting(websocket: WebSocket, meeting_id: str):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvloop and httptools come with uvicorn[standard]
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop", http="httptools", ws="websockets")
@@ -57,7 +57,15 @@ class MeetingClient {
                     this.onStateUpdate(data.meeting);
                 }
                 break;
-                
+
+            case 'state_delta':
+                if (!this.meetingState) break;
+                this._applyDelta(data.delta);
+                if (this.onStateUpdate) {
+                    this.onStateUpdate(this.meetingState);
+                }
+                break;
+
             case 'interim_transcript':
                 if (this.onInterimTranscript) {
                     this.onInterimTranscript(data.text, data.speaker);
@@ -78,6 +86,19 @@ class MeetingClient {
         }
     }
 
+    _applyDelta(delta) {
+        // Appends carry their start index; truncating first makes
+        // re-applying the same append a no-op
+        const { appends = {}, ...fields } = delta;
+        Object.assign(this.meetingState, fields);
+        for (const [field, { start, items }] of Object.entries(appends)) {
+            const list = this.meetingState[field] || [];
+            list.length = Math.min(list.length, start);
+            list.push(...items);
+            this.meetingState[field] = list;
+        }
+    }
+
     async startRecording() {
         if (this.isRecording) return;
         
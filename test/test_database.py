@@ -0,0 +1,155 @@
+"""
+Tests for backend/database.py against a temporary SQLite file.
+Run with: python -m unittest discover test
+"""
+
+import asyncio
+import sqlite3
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+import database as db  # noqa: E402
+from meeting_state import MeetingNoteManager  # noqa: E402
+
+# Column layout written by versions that kept the transcript as JSON
+LEGACY_SCHEMA = """
+    CREATE TABLE meetings (
+        id TEXT PRIMARY KEY,
+        title TEXT NOT NULL DEFAULT 'Untitled Meeting',
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        transcript TEXT DEFAULT '[]',
+        summary TEXT DEFAULT '',
+        key_points TEXT DEFAULT '[]',
+        action_items TEXT DEFAULT '[]',
+        decisions TEXT DEFAULT '[]',
+        open_questions TEXT DEFAULT '[]',
+        participants TEXT DEFAULT '[]',
+        previous_summary TEXT DEFAULT '',
+        is_active INTEGER DEFAULT 0
+    )
+"""
+LEGACY_TRANSCRIPT = (
+    '[{"speaker": "A", "text": "hello", "timestamp": "t1"},'
+    ' {"speaker": "B", "text": "hi there", "timestamp": "t2"}]'
+)
+
+
+def use_temp_db(test: unittest.TestCase) -> Path:
+    """Point the database module at a fresh file for the length of a test."""
+    tmp = tempfile.TemporaryDirectory()
+    test.addCleanup(tmp.cleanup)
+    path = Path(tmp.name) / "meetings.db"
+    # A new threading.local gives every thread (including the writer
+    # pool's) a fresh connection to the temporary file
+    for patcher in (
+        mock.patch.object(db, "DB_PATH", path),
+        mock.patch.object(db, "_local", threading.local()),
+        mock.patch.object(db, "_wal_initialized", False),
+    ):
+        patcher.start()
+        test.addCleanup(patcher.stop)
+    return path
+
+
+def transcript_count(meeting_id: str) -> int:
+    with db.get_db() as conn:
+        return conn.execute(
+            "SELECT transcript_count FROM meetings WHERE id = ?", (meeting_id,)
+        ).fetchone()[0]
+
+
+class SaveChangesTest(unittest.TestCase):
+    def setUp(self):
+        use_temp_db(self)
+        db.init_db()
+        self.manager = MeetingNoteManager("m1", initial_state=db.create_meeting("m1"))
+
+    def add(self, text, speaker="A"):
+        asyncio.run(self.manager.add_transcript(text, speaker, "t"))
+
+    def save(self):
+        self.assertTrue(db.save_meeting_changes("m1", self.manager.pop_changes()))
+
+    def test_appends_match_the_manager_state(self):
+        self.add("one")
+        self.manager._merge_result({
+            "summary": "First",
+            "key_points": ["Budget", "Timeline"],
+            "action_items": [{"task": "Send notes"}, {"task": "Book room"}],
+        })
+        self.save()
+        self.add("two", "B")
+        self.add("three")
+        self.manager._merge_result({"summary": "Second", "key_points": ["Hiring"], "decisions": ["Ship"]})
+        self.save()
+
+        meeting = db.get_meeting("m1")
+        expected = self.manager.to_dict()
+        for field in ("transcript", "summary", "key_points", "action_items", "decisions", "participants"):
+            self.assertEqual(meeting[field], expected[field], field)
+        self.assertEqual(meeting["summary"], "First\n\nSecond")
+        self.assertEqual(transcript_count("m1"), 3)
+
+    def test_rewriting_a_transcript_append_does_not_duplicate_it(self):
+        self.add("one")
+        self.add("two")
+        changes = {"appends": {"transcript": {"start": 0, "items": self.manager.meeting.transcript[:]}}}
+        db.save_meeting_changes("m1", changes)
+        db.save_meeting_changes("m1", changes)
+
+        self.assertEqual([entry["text"] for entry in db.get_meeting("m1")["transcript"]], ["one", "two"])
+        self.assertEqual(transcript_count("m1"), 2)
+
+    def test_missing_meeting_is_reported(self):
+        self.assertFalse(db.save_meeting_changes("nope", {"title": "x"}))
+
+
+class MigrationTest(unittest.TestCase):
+    def setUp(self):
+        path = use_temp_db(self)
+        conn = sqlite3.connect(path)
+        conn.execute(LEGACY_SCHEMA)
+        conn.execute(
+            "INSERT INTO meetings (id, created_at, updated_at, transcript) VALUES ('old', 't0', 't0', ?)",
+            (LEGACY_TRANSCRIPT,),
+        )
+        conn.commit()
+        conn.close()
+
+    def test_transcript_moves_to_entries_once(self):
+        db.init_db()
+        db.init_db()
+
+        meeting = db.get_meeting("old")
+        self.assertEqual(
+            meeting["transcript"],
+            [
+                {"speaker": "A", "text": "hello", "timestamp": "t1"},
+                {"speaker": "B", "text": "hi there", "timestamp": "t2"},
+            ],
+        )
+        self.assertEqual(transcript_count("old"), 2)
+        with db.get_db() as conn:
+            self.assertEqual(conn.execute("PRAGMA user_version").fetchone()[0], db.SCHEMA_VERSION)
+            self.assertEqual(
+                conn.execute("SELECT transcript FROM meetings WHERE id = 'old'").fetchone()[0], "[]"
+            )
+
+    def test_rerun_keeps_later_appends(self):
+        db.init_db()
+        entry = {"speaker": "A", "text": "later", "timestamp": "t3"}
+        db.save_meeting_changes("old", {"appends": {"transcript": {"start": 2, "items": [entry]}}})
+        db.init_db()
+
+        self.assertEqual(len(db.get_meeting("old")["transcript"]), 3)
+        self.assertEqual(transcript_count("old"), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+"""
+Tests for backend/meeting_state.py with Gemini mocked.
+Run with: python -m unittest discover test
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+import meeting_state  # noqa: E402
+
+REPLY = '{"summary": "Budget agreed", "key_points": ["Ship in May"]}'
+
+
+class GeminiReplyParsingTest(unittest.TestCase):
+    def parse(self, text):
+        with mock.patch.dict(os.environ, {"GEMINI_API_KEY": "test"}), \
+                mock.patch.object(meeting_state.genai, "configure"), \
+                mock.patch.object(meeting_state.genai, "GenerativeModel") as model:
+            model.return_value.generate_content.return_value = SimpleNamespace(text=text)
+            processor = meeting_state.GeminiProcessor()
+            return asyncio.run(processor.process_transcript_batch([], "", []))
+
+    def test_plain_json(self):
+        self.assertEqual(self.parse(REPLY)["summary"], "Budget agreed")
+
+    def test_fenced_json(self):
+        self.assertEqual(self.parse(f"```json\n{REPLY}\n```")["key_points"], ["Ship in May"])
+
+    def test_fenced_json_with_trailing_prose(self):
+        result = self.parse(f"```json\n{REPLY}\n```\nLet me know if you need more.")
+        self.assertEqual(result["summary"], "Budget agreed")
+
+    def test_plain_json_with_backticks_in_string(self):
+        reply = '{"summary": "Use ```bash``` fences for commands"}'
+        self.assertEqual(self.parse(reply)["summary"], "Use ```bash``` fences for commands")
+
+    def test_fenced_json_with_backticks_in_string(self):
+        reply = '{"summary": "Use ```bash``` fences for commands"}'
+        result = self.parse(f"```json\n{reply}\n```")
+        self.assertEqual(result["summary"], "Use ```bash``` fences for commands")
+
+
+class MergeResultTest(unittest.TestCase):
+    def test_non_string_key_points_are_skipped(self):
+        with mock.patch.object(meeting_state, "GeminiProcessor", side_effect=ValueError("off")):
+            manager = meeting_state.MeetingNoteManager("m1")
+        manager._merge_result({"key_points": [{"point": "Budget"}, "Budget", "Budget"]})
+        self.assertEqual(manager.meeting.key_points, ["Budget"])
+
+
+if __name__ == "__main__":
+    unittest.main()
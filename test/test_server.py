@@ -0,0 +1,132 @@
+"""
+Tests for MeetingSession's saving in backend/server.py, against a
+temporary SQLite file. Run with: python -m unittest discover test
+"""
+
+import asyncio
+import sys
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+import database as db  # noqa: E402
+import server  # noqa: E402
+from test_database import use_temp_db  # noqa: E402
+
+SAVE_TIMEOUT = 10  # seconds; a stuck save fails the test instead of blocking it
+
+
+def fail_once(func):
+    """Wrap func so its first call raises, like a locked database."""
+    calls = []
+
+    def wrapper(*args):
+        calls.append(args)
+        if len(calls) == 1:
+            raise RuntimeError("database is locked")
+        return func(*args)
+    return wrapper
+
+
+class PersistTest(unittest.TestCase):
+    def setUp(self):
+        use_temp_db(self)
+        db.init_db()
+
+    def run_session(self, scenario):
+        async def main():
+            session = await server.MeetingSession.open("m1", asyncio.get_running_loop())
+            await scenario(session, session.note_manager)
+            await session.save_now()
+            return await db.run_read(db.get_meeting, "m1")
+
+        return asyncio.run(asyncio.wait_for(main(), SAVE_TIMEOUT))
+
+    def test_failed_save_is_written_once_on_retry(self):
+        save = mock.Mock(side_effect=fail_once(db.save_meeting_changes))
+
+        async def scenario(session, manager):
+            await manager.add_transcript("hello", "A", "t1")
+            with self.assertRaises(RuntimeError):
+                await session.save_now()
+            await session.save_now()
+            self.assertIsNone(session.persist())
+
+        with mock.patch.object(db, "save_meeting_changes", save):
+            meeting = self.run_session(scenario)
+
+        self.assertEqual(save.call_count, 2)
+        self.assertEqual(save.call_args.args[1]["appends"]["transcript"]["start"], 0)
+        self.assertEqual([entry["text"] for entry in meeting["transcript"]], ["hello"])
+        self.assertEqual(meeting["participants"], ["A"])
+
+    def test_appends_after_partial_failure_are_not_duplicated(self):
+        # Fails after the meetings UPDATE, so the summary and list appends
+        # have to be rolled back with it
+        insert = fail_once(db._insert_transcript_entries)
+
+        async def scenario(session, manager):
+            await manager.add_transcript("one", "A", "t1")
+            manager._merge_result({"summary": "First", "key_points": ["Budget"]})
+            with self.assertRaises(RuntimeError):
+                await session.save_now()
+            await manager.add_transcript("two", "B", "t2")
+            manager._merge_result({"summary": "Second", "key_points": ["Budget", "Hiring"]})
+            await session.save_now()
+            await manager.add_transcript("three", "A", "t3")
+
+        with mock.patch.object(db, "_insert_transcript_entries", side_effect=insert):
+            meeting = self.run_session(scenario)
+
+        self.assertEqual([entry["text"] for entry in meeting["transcript"]], ["one", "two", "three"])
+        self.assertEqual(meeting["summary"], "First\n\nSecond")
+        self.assertEqual(meeting["key_points"], ["Budget", "Hiring"])
+        self.assertEqual(meeting["participants"], ["A", "B"])
+
+    def test_one_save_in_flight_with_a_follow_up(self):
+        release = threading.Event()
+        real_save = db.save_meeting_changes
+        batches = []
+
+        def blocking_save(meeting_id, changes):
+            release.wait(SAVE_TIMEOUT)
+            batches.append([entry["text"] for entry in changes["appends"]["transcript"]["items"]])
+            return real_save(meeting_id, changes)
+
+        async def scenario(session, manager):
+            await manager.add_transcript("one", "A", "t1")
+            first = session.persist()
+            await manager.add_transcript("two", "A", "t2")
+            self.assertIs(session.persist(), first)
+            release.set()
+            await asyncio.wrap_future(first)
+
+        with mock.patch.object(db, "save_meeting_changes", side_effect=blocking_save):
+            meeting = self.run_session(scenario)
+
+        self.assertEqual(batches, [["one"], ["two"]])
+        self.assertEqual([entry["text"] for entry in meeting["transcript"]], ["one", "two"])
+
+
+class UpdateMeetingTest(unittest.TestCase):
+    def setUp(self):
+        use_temp_db(self)
+        db.init_db()
+        db.create_meeting("m1", "Standup")
+
+    def test_tracked_fields_are_locked_while_active(self):
+        with mock.patch.dict(server.active_meetings, {"m1": mock.Mock()}):
+            with self.assertRaises(server.HTTPException) as caught:
+                asyncio.run(server.update_meeting("m1", {"transcript": []}))
+        self.assertEqual(caught.exception.status_code, 409)
+        self.assertEqual(db.get_meeting("m1")["title"], "Standup")
+
+    def test_tracked_fields_are_editable_when_inactive(self):
+        meeting = asyncio.run(server.update_meeting("m1", {"summary": "Edited"}))
+        self.assertEqual(meeting["summary"], "Edited")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+"""
+End-to-end run of transcribe_file's convert -> upload -> transcribe
+pipeline with GCS and Speech mocked. Run with: python -m unittest discover test
+"""
+
+import asyncio
+import sys
+import threading
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import soundfile as sf
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import transcribe_file  # noqa: E402
+from google.cloud import speech  # noqa: E402
+
+SAMPLE = Path(__file__).parent / "sample.wav"  # ~142 s, past the inline limit
+PIPELINE_TIMEOUT = 30  # seconds; a hang fails the test instead of blocking it
+
+
+def _response(text):
+    return speech.LongRunningRecognizeResponse(
+        results=[{"alternatives": [{"transcript": text}]}]
+    )
+
+
+def _fake_upload(file_obj, rewind=False, size=None, **kwargs):
+    # Like the real client: the upload reads the buffer to EOF
+    file_obj.read()
+
+
+class TranscribePipelineTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        tmp = Path(self.tmp.name)
+
+        self.client = mock.MagicMock()
+        operation = mock.MagicMock()
+        operation.result = mock.AsyncMock(return_value=_response("long file"))
+        self.client.long_running_recognize = mock.AsyncMock(return_value=operation)
+        self.client.recognize = mock.AsyncMock(return_value=_response("short clip"))
+
+        self.storage = mock.MagicMock()
+        self.storage.bucket.return_value.blob.return_value.upload_from_file.side_effect = _fake_upload
+
+        for patcher in (
+            mock.patch.object(transcribe_file, "CACHE_DIR", tmp / "cache"),
+            mock.patch.object(transcribe_file, "get_credentials"),
+            mock.patch.object(transcribe_file, "get_storage_client", return_value=self.storage),
+            mock.patch.object(transcribe_file.speech, "SpeechAsyncClient", return_value=self.client),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        transcribe_file.read_cached_transcript.cache_clear()
+        self.addCleanup(transcribe_file.read_cached_transcript.cache_clear)
+
+        # A short clip for the inline recognize() path
+        self.short = tmp / "short.wav"
+        data, rate = sf.read(SAMPLE, frames=5 * 48000)
+        sf.write(self.short, data, rate)
+
+    def run_pipeline(self, paths):
+        async def collect():
+            blobs = []
+            results = [item async for item in transcribe_file.transcribe_pipeline(paths, "bucket", blobs)]
+            return results, blobs
+
+        return asyncio.run(asyncio.wait_for(collect(), PIPELINE_TIMEOUT))
+
+    def test_long_file_is_uploaded_and_transcribed(self):
+        results, blobs = self.run_pipeline([str(SAMPLE)])
+
+        self.assertEqual(results, [(str(SAMPLE), "long file")])
+        self.assertEqual(len(blobs), 1)
+        self.client.long_running_recognize.assert_awaited_once()
+        self.client.recognize.assert_not_called()
+
+    def test_short_clip_skips_the_upload(self):
+        results, blobs = self.run_pipeline([str(self.short)])
+
+        self.assertEqual(results, [(str(self.short), "short clip")])
+        self.assertEqual(blobs, [])
+        self.client.recognize.assert_awaited_once()
+
+    def test_failed_file_still_yields_a_result(self):
+        missing = str(Path(self.tmp.name) / "missing.mp3")
+        results = dict(self.run_pipeline([missing, str(SAMPLE)])[0])
+
+        self.assertIsInstance(results[missing], BaseException)
+        self.assertEqual(results[str(SAMPLE)], "long file")
+
+    def test_rerun_hits_the_cache(self):
+        self.run_pipeline([str(SAMPLE)])
+        results, blobs = self.run_pipeline([str(SAMPLE)])
+
+        self.assertEqual(results, [(str(SAMPLE), "long file")])
+        self.assertEqual(blobs, [])
+        self.client.long_running_recognize.assert_awaited_once()
+
+    def test_consumer_error_stops_uploads_before_cleanup(self):
+        # The short clip finishes first; saving its transcript fails while
+        # the long file is still uploading
+        (Path(f"{self.short}.txt")).mkdir()
+        events = []
+        uploading = threading.Event()
+
+        def slow_upload(file_obj, **kwargs):
+            uploading.set()
+            threading.Event().wait(0.3)
+            file_obj.read()
+            events.append("uploaded")
+
+        blob = self.storage.bucket.return_value.blob.return_value
+        blob.upload_from_file.side_effect = slow_upload
+        blob.delete.side_effect = lambda: events.append("deleted")
+        self.client.recognize.side_effect = self.recognize_after(uploading)
+
+        with self.assertRaises(IsADirectoryError):
+            asyncio.run(asyncio.wait_for(
+                transcribe_file.transcribe_files([str(self.short), str(SAMPLE)], "bucket"),
+                PIPELINE_TIMEOUT,
+            ))
+        self.assertEqual(events, ["uploaded", "deleted"])
+
+    @staticmethod
+    def recognize_after(event):
+        async def recognize(**kwargs):
+            await asyncio.to_thread(event.wait, PIPELINE_TIMEOUT)
+            return _response("short clip")
+        return recognize
+
+
+class DownloadResultTest(unittest.TestCase):
+    def test_result_blob_is_deleted_when_parsing_fails(self):
+        blob = mock.Mock()
+        blob.download_as_bytes.return_value = b"not json"
+        storage_client = mock.Mock()
+        storage_client.bucket.return_value.blob.return_value = blob
+        with mock.patch.object(transcribe_file, "get_storage_client", return_value=storage_client):
+            with self.assertRaises(Exception):
+                transcribe_file._download_result("gs://bucket/talk.flac.result.json")
+        storage_client.bucket.assert_called_once_with("bucket")
+        blob.delete.assert_called_once_with()
+
+
+if __name__ == "__main__":
+    unittest.main()
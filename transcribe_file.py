@@ -1,9 +1,23 @@
 import os
-import json
+import io
 import base64
 import argparse
 import sys
 import subprocess
+import hashlib
+import mmap
+import asyncio
+import contextlib
+import itertools
+import operator
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+import numpy as np
+import soundfile as sf
+import soxr
+import orjson
 from dotenv import load_dotenv
 from google.oauth2 import service_account
 from google.cloud import speech
@@ -12,6 +26,43 @@ from google.cloud import storage
 # Load environment variables
 load_dotenv()
 
+# GCP's 'Golden Format': Mono, 16kHz, 16-bit -- sent as lossless FLAC,
+# which is roughly half the bytes of the same audio as a Linear16 WAV
+TARGET_RATE = 16000
+DECODE_BLOCK_FRAMES = 65536
+FFMPEG_NICENESS = 5  # ffmpeg fallback runs at lower CPU priority
+
+# Files above this size are uploaded as parallel parts and composed in GCS.
+# Parts live under "<blob>-tmp-parts/" until compose; a lifecycle rule on
+# that prefix (e.g. delete after 1 day) cleans up after interrupted runs.
+PARALLEL_UPLOAD_THRESHOLD = 32 * 1024 * 1024
+PARALLEL_UPLOAD_PART_SIZE = 16 * 1024 * 1024
+PARALLEL_UPLOAD_WORKERS = 8
+MAX_COMPOSE_PARTS = 32  # GCS compose limit
+
+# Several files run through convert -> upload -> transcribe as overlapping
+# stages; each hand-off queue holds at most this many files, which bounds
+# how many converted files sit in memory
+PIPELINE_QUEUE_SIZE = 2
+TRANSCRIBE_TIMEOUT = 2700  # seconds, per job
+# Past this much audio the job writes its result to GCS next to the input
+# instead of returning it over gRPC; a multi-hour diarized response is
+# tens of MB of words, which then sit in memory as one message
+GCS_RESULT_MIN_SECONDS = 3600
+# Clips shorter than this are sent inline to the synchronous recognize()
+# (its limit is 1 minute): no upload, no job to poll, no blob to delete
+INLINE_MAX_SECONDS = 55
+
+TRANSCRIBE_MODEL = "latest_long"  # Best model for long-form content
+TRANSCRIBE_LANGUAGE = "en-US"
+
+# Finished transcripts are kept on disk keyed by a hash of the converted
+# audio plus the model settings, so re-running a file skips the upload and
+# the transcription job entirely. A hash of the raw input file is stored
+# as a second key, which lets an unchanged file hit before it's decoded
+CACHE_DIR = Path(os.getenv("XDG_CACHE_HOME", Path.home() / ".cache")) / "gcp-stt"
+
+@lru_cache(maxsize=1)
 def get_credentials():
     b64_key = os.getenv("GOOGLE_CREDENTIALS_BASE64")
     if not b64_key:
@@ -19,53 +70,290 @@ def get_credentials():
         sys.exit(1)
     
     try:
-        json_key = base64.b64decode(b64_key).decode("utf-8")
-        key_dict = json.loads(json_key)
+        key_dict = orjson.loads(base64.b64decode(b64_key))
         return service_account.Credentials.from_service_account_info(key_dict)
     except Exception as e:
         print(f"Error decoding credentials: {e}")
         sys.exit(1)
 
-def convert_to_optimized_wav(input_path):
+@lru_cache(maxsize=1)
+def get_storage_client():
+    return storage.Client(credentials=get_credentials())
+
+def convert_to_optimized_flac(input_path):
     """
-    Converts audio to GCP's 'Golden Format': Mono, 16kHz, Linear16 WAV.
+    Converts audio to GCP's 'Golden Format': Mono, 16kHz, 16-bit FLAC.
     This prevents MP3 decoding errors and improves accuracy.
+
+    Decodes and resamples in-process (libsndfile + soxr) and returns the
+    FLAC as an in-memory file. Formats libsndfile can't read fall back to
+    ffmpeg.
     """
-    output_path = input_path + ".optimized.wav"
-    print(f"Converting '{input_path}' to optimized WAV...")
-    
+    print(f"Converting '{input_path}' to optimized FLAC...")
+    try:
+        return _convert_in_process(input_path)
+    except RuntimeError as e:
+        # soundfile raises LibsndfileError (a RuntimeError) for unknown formats
+        print(f"In-process decode failed ({e}), falling back to ffmpeg...")
+        return _convert_with_ffmpeg(input_path)
+
+def _convert_in_process(input_path):
+    flac = io.BytesIO()
+    with sf.SoundFile(input_path) as src, sf.SoundFile(
+        flac, mode="w", samplerate=TARGET_RATE, channels=1, format="FLAC", subtype="PCM_16"
+    ) as dst:
+        resampler = soxr.ResampleStream(src.samplerate, TARGET_RATE, 1, dtype="float32")
+        for block in src.blocks(blocksize=DECODE_BLOCK_FRAMES, dtype="float32", always_2d=True):
+            # Mix to Mono, then resample; the stream keeps filter state across blocks
+            dst.write(resampler.resample_chunk(block.mean(axis=1)))
+        dst.write(resampler.resample_chunk(np.zeros(0, dtype=np.float32), last=True))
+    flac.seek(0)
+    return flac
+
+def _convert_with_ffmpeg(input_path):
+    # Raw PCM on stdout: nothing touches the disk, and libsndfile encodes
+    # the FLAC (ffmpeg can't fill in the stream info on a pipe)
     command = [
-        "ffmpeg", "-i", input_path, 
+        "ffmpeg", "-nostdin", "-loglevel", "error",
+        "-threads", "0",  # let the decoder use every core
+        "-i", input_path, 
         "-ac", "1",      # Mix to Mono
-        "-ar", "16000",  # Resample to 16kHz
-        "-y",            # Overwrite
-        output_path
+        "-ar", str(TARGET_RATE),  # Resample to 16kHz
+        "-c:a", "pcm_s16le", "-f", "s16le",   # Linear16
+        "pipe:1"
     ]
     
     try:
-        subprocess.run(command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        return output_path
-    except subprocess.CalledProcessError:
-        print("Error: FFmpeg failed.")
-        sys.exit(1)
+        with subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE) as proc:
+            # Nice the decode so it doesn't starve the uploads running
+            # alongside it (preexec_fn isn't safe from the pipeline's threads)
+            if hasattr(os, "setpriority"):
+                try:
+                    os.setpriority(os.PRIO_PROCESS, proc.pid, FFMPEG_NICENESS)
+                except OSError:
+                    pass
+            pcm, err = proc.communicate()
     except FileNotFoundError:
         print("Error: 'ffmpeg' not found. Please install it (sudo apt install ffmpeg).")
         sys.exit(1)
+    if proc.returncode:
+        print(f"Error: FFmpeg failed. {err.decode(errors='replace').strip()}")
+        sys.exit(1)
+
+    flac = io.BytesIO()
+    sf.write(flac, np.frombuffer(pcm, dtype=np.int16), TARGET_RATE, format="FLAC", subtype="PCM_16")
+    flac.seek(0)
+    return flac
 
-def upload_to_gcs(bucket_name, source_file_path, credentials):
-    storage_client = storage.Client(credentials=credentials)
-    bucket = storage_client.bucket(bucket_name)
-    blob_name = os.path.basename(source_file_path)
+def upload_to_gcs(bucket_name, audio_file, blob_name):
+    bucket = get_storage_client().bucket(bucket_name)
     blob = bucket.blob(blob_name)
 
     print(f"Uploading to gs://{bucket_name}/{blob_name}...")
-    blob.upload_from_filename(source_file_path)
+    data = audio_file.getbuffer()
+    if len(data) > PARALLEL_UPLOAD_THRESHOLD:
+        _parallel_composite_upload(bucket, blob, data)
+    else:
+        # Passing size lets the client send files up to 8MiB as one
+        # multipart request instead of opening a resumable session
+        blob.upload_from_file(
+            audio_file, rewind=True, size=len(data), content_type="audio/flac", checksum="crc32c"
+        )
     return f"gs://{bucket_name}/{blob_name}", blob
 
-def transcribe_gcs_uri(gcs_uri, credentials):
-    client = speech.SpeechClient(credentials=credentials)
-    audio = speech.RecognitionAudio(uri=gcs_uri)
-    
+def _parallel_composite_upload(bucket, blob, data):
+    """Upload data as concurrent part objects, then compose them into blob."""
+    # Grow the parts for very long files so we stay within compose's limit
+    part_size = max(PARALLEL_UPLOAD_PART_SIZE, -(-len(data) // MAX_COMPOSE_PARTS))
+    offsets = range(0, len(data), part_size)
+    parts = [bucket.blob(f"{blob.name}-tmp-parts/{i:02d}") for i in range(len(offsets))]
+
+    def upload_part(part, offset):
+        part.upload_from_string(
+            bytes(data[offset:offset + part_size]), content_type="audio/flac", checksum="crc32c"
+        )
+
+    print(f"Uploading {len(parts)} parts in parallel...")
+    try:
+        with ThreadPoolExecutor(max_workers=PARALLEL_UPLOAD_WORKERS) as pool:
+            # list() re-raises the first failed part
+            list(pool.map(upload_part, parts, offsets))
+        blob.content_type = "audio/flac"
+        blob.compose(parts)
+    finally:
+        for part in parts:
+            try:
+                part.delete()
+            except Exception:
+                pass  # never uploaded, or left for the lifecycle rule
+
+def transcript_cache_key(audio_file):
+    h = hashlib.sha256(f"{TRANSCRIBE_MODEL}|{TRANSCRIBE_LANGUAGE}|".encode())
+    h.update(audio_file.getbuffer())
+    return h.hexdigest()
+
+def source_cache_key(path):
+    h = hashlib.sha256(f"{TRANSCRIBE_MODEL}|{TRANSCRIBE_LANGUAGE}|source|".encode())
+    with open(path, "rb") as f:
+        # Hash the page-cache mapping in one call: no read() copy, and
+        # hashlib drops the GIL for the whole file. Empty files can't be mapped
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                h.update(mm)
+    return h.hexdigest()
+
+@lru_cache(maxsize=128)
+def read_cached_transcript(key):
+    try:
+        return (CACHE_DIR / f"{key}.txt").read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return None
+
+def write_cached_transcript(keys, text):
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    for key in keys:
+        path = CACHE_DIR / f"{key}.txt"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, path)  # readers never see a half-written file
+    read_cached_transcript.cache_clear()
+
+def _convert_or_lookup(path):
+    """
+    Returns (cached transcript or None, converted FLAC or None, cache keys).
+    The FLAC is None when the raw file already hit, so nothing was decoded.
+    """
+    keys = [source_cache_key(path)]
+    if (text := read_cached_transcript(keys[0])) is not None:
+        return text, None, keys
+    audio_file = convert_to_optimized_flac(path)
+    keys.append(transcript_cache_key(audio_file))
+    return read_cached_transcript(keys[1]), audio_file, keys
+
+async def transcribe_pipeline(file_paths, bucket_name, blobs):
+    """
+    Transcribe several files with the stages overlapped: while one file's
+    job runs on the server, the next is uploading and the one after that
+    is converting. Files whose converted audio is already in the transcript
+    cache skip the upload and job, and clips under INLINE_MAX_SECONDS skip
+    the upload. Uploaded blobs are appended to blobs for cleanup.
+    Yields (path, transcript or exception) as each file finishes; if a
+    stage itself dies, its exception is raised instead of a result.
+    """
+    # One async client for every job; its grpc.aio channel multiplexes
+    # them, and waiting on a job doesn't tie up a thread
+    client = speech.SpeechAsyncClient(credentials=get_credentials())
+    upload_q = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    results = asyncio.Queue()
+    tasks = []
+
+    def spawn(coro):
+        task = asyncio.create_task(coro)
+        task.add_done_callback(check_stage)
+        tasks.append(task)
+
+    def check_stage(task):
+        # Every file's work is wrapped below, so this is a bug, not a bad
+        # file; wake the consumer rather than leave it waiting forever
+        if not task.cancelled() and task.exception() is not None:
+            results.put_nowait((None, task.exception()))
+
+    async def convert_stage():
+        for path in file_paths:
+            try:
+                cached, audio_file, keys = await asyncio.to_thread(_convert_or_lookup, path)
+                if cached is not None:
+                    print(f"Using cached transcript for {path}")
+                    if audio_file is not None:
+                        # Same audio under a new container/tags: remember this file too
+                        try:
+                            write_cached_transcript(keys[:1], cached)
+                        except OSError:
+                            pass
+                    await results.put((path, cached))
+                    continue
+                duration = audio_duration(audio_file)
+                if duration < INLINE_MAX_SECONDS:
+                    audio = speech.RecognitionAudio(content=audio_file.getvalue())
+                    spawn(transcribe_stage(path, audio, duration, keys))
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except BaseException as e:  # ffmpeg errors sys.exit
+                await results.put((path, e))
+                continue
+            # The duration travels with the buffer: after the upload it's
+            # left at EOF, where libsndfile can't read the header
+            await upload_q.put((path, audio_file, duration, keys))
+        await upload_q.put(None)
+
+    async def upload_stage():
+        while (item := await upload_q.get()) is not None:
+            path, audio_file, duration, keys = item
+            try:
+                # Unique per input: a/talk.mp3 and b/talk.mp3 must not share a
+                # blob (or the job result written next to it)
+                blob_name = f"{uuid.uuid4().hex}-{os.path.basename(path)}.optimized.flac"
+                upload = asyncio.ensure_future(
+                    asyncio.to_thread(upload_to_gcs, bucket_name, audio_file, blob_name)
+                )
+                try:
+                    gcs_uri, blob_obj = await asyncio.shield(upload)
+                except asyncio.CancelledError:
+                    # The upload thread can't be interrupted: let it finish
+                    # so its blob is recorded for cleanup, not leaked
+                    with contextlib.suppress(Exception):
+                        blobs.append((await upload)[1])
+                    raise
+                blobs.append(blob_obj)
+                audio = speech.RecognitionAudio(uri=gcs_uri)
+                spawn(transcribe_stage(path, audio, duration, keys))
+            except asyncio.CancelledError:
+                raise
+            except BaseException as e:
+                await results.put((path, e))
+
+    async def transcribe_stage(path, audio, duration, keys):
+        try:
+            text = await transcribe_audio_async(audio, client, duration)
+        except asyncio.CancelledError:
+            raise
+        except BaseException as e:
+            text = e
+        else:
+            try:
+                write_cached_transcript(keys, text)
+            except OSError as e:
+                print(f"Warning: could not cache transcript for {path}: {e}")
+        await results.put((path, text))
+
+    spawn(convert_stage())
+    spawn(upload_stage())
+    try:
+        # Every file ends in exactly one result
+        for _ in file_paths:
+            path, result = await results.get()
+            if path is None:
+                raise result
+            yield path, result
+    finally:
+        # Stop the stages, and wait until they have, before the caller
+        # cleans up blobs
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+def audio_duration(audio_file):
+    audio_file.seek(0)
+    duration = sf.info(audio_file).duration  # from the FLAC stream info
+    audio_file.seek(0)
+    return duration
+
+async def transcribe_audio_async(audio, client, duration=0):
+    """
+    Transcribes a RecognitionAudio: inline content through the synchronous
+    recognize(), a gs:// URI as a long-running job.
+    """
     # Speaker Diarization Config
     diarization_config = speech.SpeakerDiarizationConfig(
         enable_speaker_diarization=True,
@@ -73,99 +361,115 @@ def transcribe_gcs_uri(gcs_uri, credentials):
         max_speaker_count=6 # Adjust if you know the exact number
     )
 
-    # Recognition Config (Strictly Linear16 for best results)
+    # Recognition Config (lossless FLAC: same samples as Linear16, fewer bytes)
     config = speech.RecognitionConfig(
-        encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
-        sample_rate_hertz=16000,
-        language_code="en-US",
+        encoding=speech.RecognitionConfig.AudioEncoding.FLAC,
+        sample_rate_hertz=TARGET_RATE,
+        language_code=TRANSCRIBE_LANGUAGE,
         enable_automatic_punctuation=True,
-        audio_channel_count=1, 
-        model="latest_long", # Best model for long-form content
+        model=TRANSCRIBE_MODEL,
+        max_alternatives=1,  # only alternatives[0] is read
         diarization_config=diarization_config
     )
 
-    print("Starting transcription job (LongRunning)...")
-    operation = client.long_running_recognize(config=config, audio=audio)
+    if audio.content:
+        print(f"Transcribing {duration:.0f}s clip inline...")
+        return format_transcript(await client.recognize(config=config, audio=audio))
 
-    print("Processing... (This takes about 30% of the audio duration)")
-    response = operation.result(timeout=2700) 
+    request = speech.LongRunningRecognizeRequest(config=config, audio=audio)
+    result_uri = None
+    if duration > GCS_RESULT_MIN_SECONDS:
+        result_uri = audio.uri + ".result.json"
+        request.output_config = speech.TranscriptOutputConfig(gcs_uri=result_uri)
+
+    print(f"Starting transcription job (LongRunning) for {audio.uri}...")
+    operation = await client.long_running_recognize(request=request)
+    response = await operation.result(timeout=TRANSCRIBE_TIMEOUT)
+    if result_uri:
+        response = await asyncio.to_thread(_download_result, result_uri)
+    return format_transcript(response)
+
+def _download_result(result_uri):
+    bucket_name, blob_name = result_uri.removeprefix("gs://").split("/", 1)
+    blob = get_storage_client().bucket(bucket_name).blob(blob_name)
+    try:
+        data = blob.download_as_bytes()
+        return speech.LongRunningRecognizeResponse.from_json(data, ignore_unknown_fields=True)
+    finally:
+        # Not in the pipeline's blobs list, so removed here even when the
+        # download or parse fails
+        try:
+            blob.delete()
+        except Exception as e:
+            print(f"Could not delete {result_uri}: {e}")
 
+def format_transcript(response):
     # Processing Results
     if not response.results:
         return "No speech detected."
 
-    result = response.results[-1]
-    if not result.alternatives[0].words:
-        return result.alternatives[0].transcript
+    alternative = response.results[-1].alternatives[0]
+    if not alternative.words:
+        return alternative.transcript
 
-    # Reconstruct transcript with Speaker Tags
-    full_transcript = []
-    current_speaker = None
-    current_sentence = []
-    
-    words_info = result.alternatives[0].words
-    for word_info in words_info:
-        speaker_tag = word_info.speaker_tag
-        
-        if current_speaker is None:
-            current_speaker = speaker_tag
-        
-        if speaker_tag != current_speaker:
-            full_transcript.append(f"[Speaker {current_speaker}]: {' '.join(current_sentence)}")
-            current_sentence = []
-            current_speaker = speaker_tag
-            
-        current_sentence.append(word_info.word)
+    # Reconstruct transcript with Speaker Tags. Read the words off the raw
+    # protobuf in one pass (proto-plus attribute access is slow over
+    # 100k+ words), then group consecutive words by speaker.
+    words = speech.SpeechRecognitionAlternative.pb(alternative).words
+    tagged = [(word_info.speaker_tag, word_info.word) for word_info in words]
+    return "\n".join(
+        f"[Speaker {speaker_tag}]: {' '.join(word for _, word in run)}"
+        for speaker_tag, run in itertools.groupby(tagged, key=operator.itemgetter(0))
+    )
 
-    if current_sentence:
-        full_transcript.append(f"[Speaker {current_speaker}]: {' '.join(current_sentence)}")
+async def transcribe_files(file_paths, bucket_name):
+    blobs = []
+    try:
+        # 1. Convert (in memory), 2. Upload, 3. Transcribe -- pipelined
+        # aclosing: if this loop raises, the pipeline's stages are stopped
+        # before the finally below deletes the blobs
+        async with contextlib.aclosing(transcribe_pipeline(file_paths, bucket_name, blobs)) as results:
+            async for file_path, text in results:
+                if isinstance(text, BaseException):
+                    print(f"\nError processing '{file_path}': {text}")
+                    continue
 
-    return "\n".join(full_transcript)
+                print(f"\n--- FINAL TRANSCRIPT: {file_path} ---")
+                print(text)
+            
+                output_file = f"{file_path}.txt"
+                with open(output_file, "w") as f:
+                    f.write(text)
+                print(f"\nSaved to: {output_file}")
+
+    finally:
+        # 4. Cleanup Cloud
+        if blobs:
+            print("Cleaning up cloud storage...")
+        for blob_obj in blobs:
+            try:
+                blob_obj.delete()
+            except Exception as e:
+                print(f"Could not delete gs://{blob_obj.bucket.name}/{blob_obj.name}: {e}")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
-    parser.add_argument("file_path", help="Path to local audio file")
+    parser.add_argument("file_paths", nargs="+", help="Path(s) to local audio file(s)")
     args = parser.parse_args()
 
-    if not os.path.exists(args.file_path):
-        print(f"Error: File '{args.file_path}' not found.")
-        sys.exit(1)
+    for file_path in args.file_paths:
+        if not os.path.exists(file_path):
+            print(f"Error: File '{file_path}' not found.")
+            sys.exit(1)
 
     bucket_name = os.getenv("GOOGLE_BUCKET_NAME")
     if not bucket_name:
         print("Error: GOOGLE_BUCKET_NAME missing in .env")
         sys.exit(1)
 
-    temp_wav_path = None
     try:
-        creds = get_credentials()
-        
-        # 1. Convert
-        temp_wav_path = convert_to_optimized_wav(args.file_path)
-
-        # 2. Upload
-        gcs_uri, blob_obj = upload_to_gcs(bucket_name, temp_wav_path, creds)
-        
-        # 3. Transcribe
-        text = transcribe_gcs_uri(gcs_uri, creds)
-
-        print("\n--- FINAL TRANSCRIPT ---")
-        print(text)
-        
-        output_file = f"{args.file_path}.txt"
-        with open(output_file, "w") as f:
-            f.write(text)
-        print(f"\nSaved to: {output_file}")
-
-        # 4. Cleanup Cloud
-        print("Cleaning up cloud storage...")
-        blob_obj.delete()
-
+        # Fail fast on bad credentials before converting
+        get_credentials()
+        asyncio.run(transcribe_files(args.file_paths, bucket_name))
     except Exception as e:
         print(f"\nCRITICAL ERROR: {e}")
-    
-    finally:
-        # 5. Cleanup Local Temp
-        if temp_wav_path and os.path.exists(temp_wav_path):
-            os.remove(temp_wav_path)
-            print("Temporary WAV deleted.")
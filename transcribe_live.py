@@ -1,9 +1,12 @@
 import os
 import sys
+import argparse
 import queue
-import json
 import base64
+from functools import lru_cache
+import numpy as np
 import pyaudio
+import orjson
 from dotenv import load_dotenv
 from google.oauth2 import service_account
 from google.cloud import speech
@@ -14,6 +17,15 @@ load_dotenv()
 RATE = 16000
 CHUNK = int(RATE / 10)  # 100ms
 
+# Silence gating (--silence-threshold): frames whose mean absolute int16
+# level stays under the threshold aren't sent. The last SILENCE_HANGOVER
+# seconds after speech still go out so the recognizer can finalize, and
+# one frame every SILENCE_KEEPALIVE seconds keeps the stream from timing
+# out (Google closes it after ~10s without audio)
+SILENCE_HANGOVER = 1.0
+SILENCE_KEEPALIVE = 5.0
+
+@lru_cache(maxsize=1)
 def get_credentials():
     b64_key = os.getenv("GOOGLE_CREDENTIALS_BASE64")
     if not b64_key:
@@ -21,19 +33,24 @@ def get_credentials():
         sys.exit(1)
     
     try:
-        json_key = base64.b64decode(b64_key).decode("utf-8")
-        key_dict = json.loads(json_key)
+        key_dict = orjson.loads(base64.b64decode(b64_key))
         return service_account.Credentials.from_service_account_info(key_dict)
     except Exception as e:
         print(f"Error decoding credentials: {e}")
         sys.exit(1)
 
+@lru_cache(maxsize=1)
+def get_speech_client():
+    return speech.SpeechClient(credentials=get_credentials())
+
 class MicrophoneStream:
     """Opens a recording stream as a generator yielding the audio chunks."""
-    def __init__(self, rate, chunk):
+    def __init__(self, rate, chunk, silence_threshold=0):
         self._rate = rate
         self._chunk = chunk
-        self._buff = queue.Queue()
+        self._silence_threshold = silence_threshold
+        # Lock-free C queue; nothing here needs task_done()/join()
+        self._buff = queue.SimpleQueue()
         self.closed = True
 
     def __enter__(self):
@@ -57,71 +74,113 @@ class MicrophoneStream:
         self._audio_interface.terminate()
 
     def _fill_buffer(self, in_data, frame_count, time_info, status_flags):
-        self._buff.put(in_data)
+        # Zero-copy int16 view over the callback's bytes
+        self._buff.put(np.frombuffer(in_data, dtype=np.int16))
         return None, pyaudio.paContinue
 
     def generator(self):
+        hangover = int(self._rate * SILENCE_HANGOVER)
+        keepalive = int(self._rate * SILENCE_KEEPALIVE)
+        quiet = skipped = 0  # samples since last speech / since last send
         while not self.closed:
             chunk = self._buff.get()
             if chunk is None: return
-            data = [chunk]
-            while True:
-                try:
-                    chunk = self._buff.get(block=False)
-                    if chunk is None: return
-                    data.append(chunk)
-                except queue.Empty:
-                    break
-            yield b"".join(data)
+            # Usually only one chunk is waiting; stragglers are joined with
+            # one concatenate. We're the only consumer, so qsize() > 0
+            # means get() won't block -- no queue.Empty raised on every drain
+            chunks = [chunk]
+            while self._buff.qsize():
+                more = self._buff.get()
+                if more is None: return
+                chunks.append(more)
+            audio = chunk if len(chunks) == 1 else np.concatenate(chunks)
+
+            if self._silence_threshold:
+                # int32 so abs(-32768) doesn't wrap
+                if np.abs(audio, dtype=np.int32).mean() >= self._silence_threshold:
+                    quiet = 0
+                else:
+                    quiet += len(audio)
+                if quiet > hangover and skipped + len(audio) < keepalive:
+                    skipped += len(audio)
+                    continue
+                skipped = 0
+            yield audio.tobytes()
+
+CLEAR_LINE = b"\r\033[K"
 
 def listen_print_loop(responses):
-    print("\nListening... (Press Ctrl+C to stop)")
+    print("\nListening... (Press Ctrl+C to stop)", flush=True)
+    # Called at the server's push rate: bind the hot lookups once and write
+    # encoded bytes straight to the binary stdout, flushed per update so
+    # it stays in order with print()
+    write = sys.stdout.buffer.write
+    flush = sys.stdout.buffer.flush
     for response in responses:
-        if not response.results: continue
-        result = response.results[0]
-        if not result.alternatives: continue
-
-        transcript = result.alternatives[0].transcript
+        results = response.results
+        if not results: continue
+        result = results[0]
+        alternatives = result.alternatives
+        if not alternatives: continue
+        alternative = alternatives[0]
+        transcript = alternative.transcript
 
         # "is_final=False" means the user is still speaking
         if not result.is_final:
-            sys.stdout.write(f"\r\033[K> {transcript}")
-            sys.stdout.flush()
+            write(CLEAR_LINE + b"> " + transcript.encode())
         else:
             # "is_final=True" means the sentence is done. Check Speaker Tag.
             # Live speaker tags are attached to the last word.
             speaker_tag = "?"
-            if result.alternatives[0].words:
-                speaker_tag = result.alternatives[0].words[-1].speaker_tag
-            
-            print(f"\r\033[K[Speaker {speaker_tag}]: {transcript}")
+            words = alternative.words
+            if words:
+                speaker_tag = words[-1].speaker_tag
 
-def main():
-    creds = get_credentials()
-    client = speech.SpeechClient(credentials=creds)
+            write(CLEAR_LINE + f"[Speaker {speaker_tag}]: {transcript}\n".encode())
+        flush()
 
-    diarization_config = speech.SpeakerDiarizationConfig(
-        enable_speaker_diarization=True,
-        min_speaker_count=1,
-        max_speaker_count=4
-    )
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--single-utterance", action="store_true",
+                        help="Stop after the first sentence (finalizes faster)")
+    parser.add_argument("--single-speaker", action="store_true",
+                        help="Skip speaker diarization (lower latency)")
+    parser.add_argument("--silence-threshold", type=int, default=0, metavar="LEVEL",
+                        help="Don't send audio quieter than this mean int16 level "
+                             "(e.g. 300); 0 sends everything")
+    args = parser.parse_args()
+
+    client = get_speech_client()
+
+    diarization_config = None
+    if not args.single_speaker:
+        diarization_config = speech.SpeakerDiarizationConfig(
+            enable_speaker_diarization=True,
+            min_speaker_count=1,
+            max_speaker_count=4
+        )
 
     config = speech.RecognitionConfig(
         encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
         sample_rate_hertz=RATE,
         language_code="en-US",
         enable_automatic_punctuation=True,
+        max_alternatives=1,  # only alternatives[0] is ever printed
         diarization_config=diarization_config
     )
 
     streaming_config = speech.StreamingRecognitionConfig(
         config=config,
-        interim_results=True 
+        interim_results=True,
+        single_utterance=args.single_utterance,
     )
 
-    with MicrophoneStream(RATE, CHUNK) as stream:
+    with MicrophoneStream(RATE, CHUNK, args.silence_threshold) as stream:
         audio_generator = stream.generator()
-        requests = (speech.StreamingRecognizeRequest(audio_content=content) for content in audio_generator)
+        # Raw protobuf requests skip the proto-plus wrapper; the client's
+        # serializer accepts either
+        request_pb = speech.StreamingRecognizeRequest.pb()
+        requests = (request_pb(audio_content=content) for content in audio_generator)
 
         try:
             responses = client.streaming_recognize(config=streaming_config, requests=requests)